@@ -0,0 +1,37 @@
+import datetime
+import random
+
+from cogs.event import HARI
+from cogs.garapan import KATEGORI_OPTIONS
+
+LINK = "https://discord.com/channels/1036563469106954270/{}/{}"
+WORDS = ["Testnet", "Quest", "AMA", "Mint", "Airdrop", "Campaign", "Node", "Galxe", "Zealy", "Snapshot"]
+
+def link(rng):
+    return LINK.format(rng.randrange(10**18, 10**19), rng.randrange(10**18, 10**19))
+
+def synthetic_events(n, now, seed=0):
+    # Spread over [-15, +45) days so a quarter is already expired; some repeat.
+    rng = random.Random(seed)
+    events = []
+    for i in range(n):
+        dt = now + datetime.timedelta(minutes=rng.randrange(-15 * 1440, 45 * 1440))
+        ulang = rng.choices([0, 1, 7], weights=[85, 5, 10])[0]
+        sampai = (dt + datetime.timedelta(days=rng.randrange(7, 60))).strftime("%d/%m/%Y") if ulang else ""
+        events.append({
+            "nama": f"{rng.choice(WORDS)} {rng.choice(WORDS)} #{i}",
+            "sumber": link(rng),
+            "hari": HARI[dt.weekday()],
+            "tanggal": dt.strftime("%d/%m/%Y"),
+            "jam": dt.strftime("%H:%M"),
+            "akses": rng.choice(["@member", "@sbx"]),
+            "ulang": ulang,
+            "sampai": sampai,
+            "zona": "UTC",
+        })
+    return events
+
+def synthetic_garapan(n, seed=0):
+    rng = random.Random(seed)
+    return [{"judul": f"{rng.choice(WORDS)} {i}", "kategori": rng.choice(KATEGORI_OPTIONS), "link": link(rng)}
+            for i in range(n)]
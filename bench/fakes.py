@@ -0,0 +1,64 @@
+import asyncio
+from types import SimpleNamespace
+
+from utils.guilds import LEGACY_GUILD_ID
+
+
+class FakeResponse:
+    # Records what a handler would have sent instead of calling the API.
+    def __init__(self):
+        self.sent = []
+
+    def is_done(self):
+        return bool(self.sent)
+
+    async def send_message(self, content=None, **kwargs):
+        self.sent.append(("send_message", content, kwargs))
+
+    async def edit_message(self, **kwargs):
+        self.sent.append(("edit_message", None, kwargs))
+
+    async def send_modal(self, modal):
+        self.sent.append(("send_modal", None, {"modal": modal}))
+
+    async def defer(self, **kwargs):
+        self.sent.append(("defer", None, kwargs))
+
+
+class FakeHttp:
+    # Stands in for bot.http in utils.links.PreviewFetcher: answers
+    # get_message() from memory after `delay` seconds and counts requests.
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = []
+
+    async def get_message(self, channel_id, message_id):
+        self.requests.append((channel_id, message_id))
+        await asyncio.sleep(self.delay)
+        return {"id": str(message_id), "channel_id": str(channel_id), "content": f"Pesan {message_id}",
+                "author": {"username": "tester"}, "timestamp": "2025-01-01T00:00:00+00:00"}
+
+
+class FakeChannel:
+    # Every channel is readable by everyone.
+    def permissions_for(self, member):
+        return SimpleNamespace(view_channel=True, read_message_history=True)
+
+
+class FakeGuild:
+    def __init__(self, guild_id):
+        self.id = guild_id
+
+    def get_channel_or_thread(self, channel_id):
+        return FakeChannel()
+
+
+class FakeInteraction:
+    def __init__(self, role_ids=(), user_id=1, guild_id=LEGACY_GUILD_ID, client=None):
+        self.guild = FakeGuild(guild_id)
+        self.user = SimpleNamespace(id=user_id, roles=[SimpleNamespace(id=r) for r in role_ids], guild=self.guild)
+        self.guild_id = guild_id
+        self.client = client
+        self.command = None
+        self.extras = {}
+        self.response = FakeResponse()
@@ -0,0 +1,205 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import discord
+from discord.ext import commands
+
+import utils.store
+from cogs.event import EVENT_FILE, EVENT_SCHEMA, event_records, event_store, load_events, save_events, utcnow
+from cogs.garapan import GARAPAN_FILE, GARAPAN_SCHEMA, GarapanPaginator, load_garapan
+from utils.guilds import LEGACY_GUILD_ID as GUILD, ROLE_MEMBER, ROLE_SBX
+from utils.links import PreviewFetcher
+from utils.metrics import store_io_bytes, store_io_seconds
+from bench.data import synthetic_events, synthetic_garapan
+from bench.fakes import FakeHttp, FakeInteraction
+
+# Offline benchmarks: synthetic events.json/garapan.json (the legacy guild's
+# files) are written to a temp dir and the cog handlers are driven through fake interactions, so
+# nothing touches the network or the real data files.
+#
+#   python -m bench.run --sizes 100,1000,10000 --save bench.json
+#   python -m bench.run --compare bench.json     # exit 1 on regression
+
+DEFAULT_SIZES = "100,1000,10000"
+REPEAT = 10
+TOLERANCE = 1.5
+# Simulated round trip of a message fetch for link previews.
+PREVIEW_DELAY = 0.02
+
+
+def io_totals():
+    ops = sum(sum(counts) for counts in store_io_seconds.counts.values())
+    return ops, sum(store_io_bytes.values.values())
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+
+class Bench:
+    def __init__(self, bot, size, repeat):
+        self.bot = bot
+        self.size = size
+        self.repeat = repeat
+        self.results = []
+
+    async def measure(self, name, fn, prepare=None):
+        samples, ops, nbytes = [], 0, 0
+        for _ in range(self.repeat):
+            if prepare:
+                await prepare()
+            ops0, bytes0 = io_totals()
+            start = time.perf_counter()
+            await fn()
+            samples.append(time.perf_counter() - start)
+            ops1, bytes1 = io_totals()
+            ops, nbytes = ops + ops1 - ops0, nbytes + bytes1 - bytes0
+
+        # One extra run under tracemalloc; it slows the code down, so it is
+        # kept out of the timed samples.
+        if prepare:
+            await prepare()
+        tracemalloc.start()
+        await fn()
+        allocated = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        result = {
+            "name": name, "size": self.size,
+            "p50_ms": percentile(samples, 0.5) * 1000, "p99_ms": percentile(samples, 0.99) * 1000,
+            "alloc_kb": allocated / 1024,
+            "io_ops": ops / self.repeat, "io_kb": nbytes / self.repeat / 1024,
+        }
+        self.results.append(result)
+        print_row(result)
+
+
+async def run_size(size, repeat):
+    now = utcnow()
+    with open(EVENT_FILE, "w", encoding="utf-8") as f:
+        json.dump(synthetic_events(size, now), f)
+    with open(GARAPAN_FILE, "w", encoding="utf-8") as f:
+        json.dump(synthetic_garapan(size), f)
+
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.default())
+    await bot.load_extension("cogs.event")
+    await bot.load_extension("cogs.garapan")
+    event_cog, garapan_cog = bot.get_cog("EventCog"), bot.get_cog("GarapanCog")
+    # Expired records are cleaned up by the benchmark itself, not in the background.
+    event_cog.expiry.stop()
+    events, garapan = list(load_events(bot, GUILD)), list(load_garapan(bot, GUILD))
+    for store in bot.stores.values():
+        await store.flush()
+
+    bench = Bench(bot, size, repeat)
+    http = FakeHttp(delay=PREVIEW_DELAY)
+    bot.previews = PreviewFetcher(http)
+    sbx, member = FakeInteraction([ROLE_SBX], client=bot), FakeInteraction([ROLE_MEMBER], client=bot)
+
+    async def load_fresh():
+        for schema in (EVENT_SCHEMA, GARAPAN_SCHEMA):
+            store = utils.store.get_store(SimpleNamespace(), schema)
+            store.load()
+            await store.close()
+    await bench.measure("load", load_fresh)
+
+    async def save():
+        save_events(bot, GUILD, events)
+        await event_store(bot, GUILD).flush()
+    await bench.measure("save_events", save)
+
+    async def clear_pages():
+        event_cog.page_cache.clear()
+    await bench.measure("cmd_event sbx (cold)", lambda: event_cog.cmd_event.callback(event_cog, sbx), clear_pages)
+    await bench.measure("cmd_event member (cold)", lambda: event_cog.cmd_event.callback(event_cog, member),
+                        clear_pages)
+    await bench.measure("cmd_event sbx (cached)", lambda: event_cog.cmd_event.callback(event_cog, sbx),
+                        lambda: event_cog.cmd_event.callback(event_cog, sbx))
+    await bench.measure("autocomplete event", lambda: event_cog.autocomplete_event(sbx, "quest mi"))
+
+    async def clear_previews():
+        bot.previews = PreviewFetcher(http)
+    await bench.measure("listgarapan (cold)", lambda: garapan_cog.listgarapan.callback(garapan_cog, sbx),
+                        clear_previews)
+    await bench.measure("listgarapan", lambda: garapan_cog.listgarapan.callback(garapan_cog, sbx))
+
+    async def paginate():
+        view = GarapanPaginator(garapan)
+        for page in range(min(view.max_page, 20) + 1):
+            await view.go_to(sbx, page)
+        await view.apply_filter(sbx, "Testnet")
+        await view.go_to(sbx, view.max_page)
+    await bench.measure("GarapanPaginator", paginate)
+
+    due = []
+    async def restore_events():
+        save_events(bot, GUILD, events)
+        await event_store(bot, GUILD).flush()
+        now = int(time.time())
+        due[:] = [((GUILD, rec.id), ts) for rec in event_records(bot, GUILD).values() if (ts := rec.expiry(now)) <= now]
+    await bench.measure("cleanup_expired", lambda: event_cog.cleanup_expired(due), restore_events)
+
+    await bot.unload_extension("cogs.event")
+    await bot.unload_extension("cogs.garapan")
+    await utils.store.close_stores(bot)
+    await bot.close()
+    return bench.results
+
+
+def print_row(r):
+    print(f"{r['name']:<26}{r['size']:>8}{r['p50_ms']:>11.2f}{r['p99_ms']:>11.2f}"
+          f"{r['alloc_kb']:>12.0f}{r['io_ops']:>8.1f}{r['io_kb']:>10.0f}")
+
+def compare(results, baseline, tolerance):
+    # A regression is a p50 slower than baseline * tolerance.
+    old = {(r["name"], r["size"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        prev = old.get((r["name"], r["size"]))
+        if prev and r["p50_ms"] > prev["p50_ms"] * tolerance:
+            regressions.append(f"{r['name']} @{r['size']}: {prev['p50_ms']:.2f} -> {r['p50_ms']:.2f} ms")
+    return regressions
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark cog handlers on synthetic data.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma separated record counts")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default=utils.store.STORE_BACKEND)
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON from --save; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+    utils.store.STORE_BACKEND = args.backend
+
+    print(f"{'benchmark':<26}{'size':>8}{'p50 ms':>11}{'p99 ms':>11}{'alloc KB':>12}{'io ops':>8}{'io KB':>10}")
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                results += await run_size(size, args.repeat)
+            finally:
+                os.chdir(cwd)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"❌ Regresi: {line}")
+        if regressions:
+            sys.exit(1)
+        print("✅ Tidak ada regresi.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import datetime
+import multiprocessing
+import os
+import signal
+import utils.store
+from main import create_bot, load_all_cogs, main
+from utils.cluster import ClusterState, shard_ranges
+
+# Runs the bot as several processes, each an AutoShardedBot owning one
+# contiguous range of shards. They share the SQLite stores (WAL mode) and
+# coordinate through utils.cluster.ClusterState; only the elected leader
+# runs the expiry/reminder schedulers.
+#
+#   python cluster.py --processes 2 --shards 4
+#   python cluster.py --processes 3 --stub      # no Discord connection
+
+CLUSTER_PROCESSES = int(os.getenv("CLUSTER_PROCESSES", "2"))
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))
+STUB_GUILDS_PER_SHARD = 2
+STUB_INTERVAL = float(os.getenv("STUB_INTERVAL", "10"))
+
+
+def stub_guilds(shard_ids, shard_count, per_shard=STUB_GUILDS_PER_SHARD):
+    # Fake guild ids that Discord would route to these shards.
+    return [((n * shard_count + shard) << 22) for shard in shard_ids for n in range(1, per_shard + 1)]
+
+async def run_stub(bot, shard_ids, shard_count):
+    # No gateway: cogs, leader election and the change feed run as usual
+    # and every process keeps adding events to its own guilds, which expire
+    # a minute later – only the leader should report cleaning them up.
+    from cogs.event import clean_event, event_store, utcnow
+    async with bot:
+        await load_all_cogs(bot)
+        guilds = stub_guilds(shard_ids, shard_count)
+        n = 0
+        try:
+            while True:
+                start = utcnow() + datetime.timedelta(minutes=1)
+                for guild_id in guilds:
+                    n += 1
+                    event_store(bot, guild_id).add(clean_event({
+                        "nama": f"Stub {bot.cluster.cluster_id}-{n}", "sumber": "stub",
+                        "tanggal": f"{start:%d/%m/%Y}", "jam": f"{start:%H:%M}", "akses": "member",
+                        "zona": "UTC"}))
+                await asyncio.sleep(STUB_INTERVAL)
+        finally:
+            await utils.store.close_stores(bot)
+
+def raise_interrupt(*args):
+    # Ctrl+C reaches the whole process group and the parent follows up
+    # with SIGTERM; only the first signal should interrupt the shutdown.
+    # Used by the parent and by every cluster process.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    raise KeyboardInterrupt
+
+def run_cluster(cluster_id, shard_ids, shard_count, stub=False):
+    # JSON files can't be shared between processes; the SQLite stores can.
+    utils.store.STORE_BACKEND = "sqlite"
+    signal.signal(signal.SIGINT, raise_interrupt)
+    signal.signal(signal.SIGTERM, raise_interrupt)
+    bot = create_bot(shard_ids=shard_ids, shard_count=shard_count)
+    bot.cluster = ClusterState(cluster_id)
+    print(f"🧩 Cluster {cluster_id} (pid {os.getpid()}): shard {shard_ids[0]}-{shard_ids[-1]} dari {shard_count}")
+    try:
+        asyncio.run(run_stub(bot, shard_ids, shard_count) if stub else main(bot))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Releasing the lease lets another process take over right away.
+        bot.cluster.close()
+
+def launch(processes, shard_count, stub=False):
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=run_cluster, args=(i, shards, shard_count, stub), name=f"cluster-{i}")
+             for i, shards in enumerate(shard_ranges(shard_count, processes))]
+    for p in procs:
+        p.start()
+    # A service manager stops us with SIGTERM: shut the children down the
+    # same way as on Ctrl+C instead of leaving them orphaned.
+    signal.signal(signal.SIGINT, raise_interrupt)
+    signal.signal(signal.SIGTERM, raise_interrupt)
+    try:
+        for p in procs:
+            p.join()
+            if p.exitcode:
+                print(f"❌ {p.name} berhenti (exit {p.exitcode})")
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.join()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jalankan bot sebagai beberapa proses shard.")
+    parser.add_argument("--processes", type=int, default=CLUSTER_PROCESSES)
+    parser.add_argument("--shards", type=int, default=SHARD_COUNT, help="total shard (default = jumlah proses)")
+    parser.add_argument("--stub", action="store_true", help="tanpa koneksi Discord, untuk tes lokal")
+    args = parser.parse_args()
+    shards = args.shards or args.processes
+    if shards < args.processes:
+        parser.error("--shards tidak boleh lebih kecil dari --processes")
+    launch(args.processes, shards, stub=args.stub)
@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import json
+import discord
+from typing import Literal
+from discord import app_commands, Interaction
+from discord.ext import commands
+from cogs.event import EVENT_SCHEMA
+from utils.cluster import is_leader
+from utils.guilds import guild_config, guild_configs
+from utils.metrics import board_updates
+from utils.records import Akses
+from utils.store import stores
+
+BOARD_DEBOUNCE = 5.0
+
+def content_hash(embed):
+    return hashlib.sha256(json.dumps(embed.to_dict(), sort_keys=True).encode()).hexdigest()
+
+class BoardCog(commands.Cog):
+    # Pinned event boards, one message per channel and tier (guild config
+    # "boards"). Every write to a guild's events, and every series moving on
+    # to its next occurrence, marks the guild stale; its boards are
+    # re-rendered once BOARD_DEBOUNCE seconds after the first change, from
+    # the same page cache /event uses, and a message is only edited when the
+    # rendered embed differs from what it already shows.
+    def __init__(self, bot):
+        self.bot = bot
+        self.pending = {}
+        # Content hash last sent, keyed by message id.
+        self.hashes = {}
+
+    async def cog_load(self):
+        stores(self.bot).watch(EVENT_SCHEMA.name, self.track_event)
+
+    async def cog_unload(self):
+        stores(self.bot).unwatch(self.track_event)
+        for task in self.pending.values():
+            task.cancel()
+
+    def track_event(self, guild_id, action, ev, old=None):
+        if action not in ("open", "evict"):
+            self.mark_stale(guild_id)
+
+    @commands.Cog.listener()
+    async def on_events_advanced(self, guild_id):
+        self.mark_stale(guild_id)
+
+    @commands.Cog.listener()
+    async def on_guild_config_changed(self, guild_id):
+        # A board was added in another cluster process.
+        self.mark_stale(guild_id)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Catch up on expiries while the bot was down; unchanged boards are skipped.
+        self.mark_all_stale()
+
+    @commands.Cog.listener()
+    async def on_leadership_changed(self, leader):
+        if leader:
+            self.mark_all_stale()
+
+    def mark_all_stale(self):
+        for guild_id in list(guild_configs(self.bot).configs):
+            self.mark_stale(int(guild_id))
+
+    def mark_stale(self, guild_id):
+        # In a cluster only the leader edits boards.
+        if guild_id in self.pending or not is_leader(self.bot):
+            return
+        if not guild_config(self.bot, guild_id)["boards"]:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self.pending[guild_id] = loop.create_task(self.delayed_refresh(guild_id))
+
+    async def delayed_refresh(self, guild_id):
+        await asyncio.sleep(BOARD_DEBOUNCE)
+        # Changes from here on schedule another refresh.
+        del self.pending[guild_id]
+        for board in guild_config(self.bot, guild_id)["boards"]:
+            await self.update_board(guild_id, board)
+
+    def render(self, guild_id, tier):
+        event_cog = self.bot.get_cog("EventCog")
+        pages = event_cog.event_pages(guild_id, Akses[tier.upper()])
+        first = pages.get(0)
+        # Pages are cached and shared with /event, so work on a copy.
+        embed = first.copy() if first else discord.Embed(description="📭 Tidak ada event.", color=discord.Color.green())
+        embed.title = f"📌 Event {tier}"
+        if pages.get(1) is not None:
+            embed.set_footer(text="Event lainnya: /event")
+        return embed
+
+    async def update_board(self, guild_id, board):
+        embed = self.render(guild_id, board["tier"])
+        digest = content_hash(embed)
+        if self.hashes.get(board["message"]) == digest:
+            board_updates.inc("unchanged")
+            return
+        message = self.bot.get_partial_messageable(board["channel"]).get_partial_message(board["message"])
+        try:
+            await message.edit(embed=embed)
+        except discord.NotFound:
+            print(f"📌 Papan event di channel {board['channel']} sudah dihapus, dilepas.")
+            self.remove_board(guild_id, board)
+            return
+        except discord.HTTPException as e:
+            board_updates.inc("error")
+            print(f"❌ Gagal update papan event {board['message']}: {e}")
+            return
+        board_updates.inc("edited")
+        self.hashes[board["message"]] = digest
+
+    def remove_board(self, guild_id, board):
+        boards = guild_config(self.bot, guild_id)["boards"]
+        guild_configs(self.bot).set(guild_id, boards=[b for b in boards if b["message"] != board["message"]])
+        self.hashes.pop(board["message"], None)
+
+    @app_commands.command(name="board", description="📌 Pasang papan event yang selalu diperbarui di channel")
+    @app_commands.describe(channel="Channel papan", tier="Event yang ditampilkan", hapus="Hapus papan ini")
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.guild_only()
+    async def board(self, interaction: Interaction, channel: discord.TextChannel,
+                    tier: Literal["member", "sbx"] = "member", hapus: bool = False):
+        boards = guild_config(self.bot, interaction.guild_id)["boards"]
+        existing = next((b for b in boards if b["channel"] == channel.id and b["tier"] == tier), None)
+        if hapus:
+            if existing is None:
+                return await interaction.response.send_message("⚠️ Tidak ada papan event di channel itu.", ephemeral=True)
+            self.remove_board(interaction.guild_id, existing)
+            try:
+                await channel.get_partial_message(existing["message"]).delete()
+            except discord.HTTPException:
+                pass
+            return await interaction.response.send_message(f"✅ Papan event {tier} di {channel.mention} dihapus.",
+                                                           ephemeral=True)
+        if existing is not None:
+            return await interaction.response.send_message(
+                f"ℹ️ Papan event {tier} sudah ada di {channel.mention}: {channel.get_partial_message(existing['message']).jump_url}",
+                ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        embed = self.render(interaction.guild_id, tier)
+        try:
+            message = await channel.send(embed=embed)
+        except discord.HTTPException as e:
+            return await interaction.followup.send(f"⚠️ Gagal kirim ke {channel.mention}: {e}", ephemeral=True)
+        note = ""
+        try:
+            await message.pin()
+        except discord.HTTPException:
+            note = " (gagal pin, beri izin Manage Messages)"
+        self.hashes[message.id] = content_hash(embed)
+        guild_configs(self.bot).set(interaction.guild_id,
+                                    boards=boards + [{"channel": channel.id, "tier": tier, "message": message.id}])
+        await interaction.followup.send(f"✅ Papan event {tier} dipasang di {channel.mention}{note}.", ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(BoardCog(bot))
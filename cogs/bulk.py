@@ -0,0 +1,106 @@
+import asyncio
+import functools
+import io
+import discord
+from typing import Literal
+from discord import app_commands, Interaction
+from discord.ext import commands
+from cogs.event import EVENT_SCHEMA, clean_event, event_records, event_store, from_ts
+from cogs.garapan import GARAPAN_SCHEMA, clean_garapan, garapan_store
+from utils.bulk import detect_format, iter_csv, iter_ics, iter_jsonl, read_rows, spool, validate_rows
+from utils.guilds import guild_config
+from utils.timezones import ZONES
+
+MAX_IMPORT_BYTES = 8 * 1024 * 1024
+ERROR_PREVIEW = 10
+
+DATASETS = {
+    "event": (event_store, EVENT_SCHEMA, clean_event),
+    "garapan": (garapan_store, GARAPAN_SCHEMA, clean_garapan),
+}
+EXPORTERS = {"csv": iter_csv, "jsonl": iter_jsonl}
+
+def event_ics_items(records):
+    # Series start in their own zone so the RRULE keeps the local hour
+    # across DST changes; one-shot events are plain UTC.
+    for rec in records:
+        item = {
+            "uid": f"event-{rec.id}@eventhelper", "summary": rec.nama, "start": from_ts(rec.start),
+            "description": rec.sumber, "url": rec.sumber, "categories": rec.akses.name.lower(),
+            "every": rec.ulang, "until": from_ts(rec.until) if rec.until is not None else None,
+        }
+        if rec.ulang:
+            item.update(start=rec.local(rec.start), tzid=ZONES[rec.zona].name)
+        yield item
+
+def event_ics_zones(records):
+    # (Zone, earliest start) of every zone a series uses, for the VTIMEZONEs.
+    since = {}
+    for rec in records:
+        if rec.ulang:
+            since[rec.zona] = min(since.get(rec.zona, rec.start), rec.start)
+    return [(ZONES[zona], ts) for zona, ts in since.items()]
+
+class BulkCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="import", description="📥 Import event/garapan dari file CSV atau JSONL")
+    @app_commands.describe(data="Jenis data", file="File .csv atau .jsonl (header sesuai field)")
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.guild_only()
+    async def cmd_import(self, interaction: Interaction, data: Literal["event", "garapan"], file: discord.Attachment):
+        fmt = detect_format(file.filename)
+        if fmt is None:
+            return await interaction.response.send_message("⚠️ File harus .csv atau .jsonl.", ephemeral=True)
+        if file.size > MAX_IMPORT_BYTES:
+            return await interaction.response.send_message(
+                f"⚠️ File terlalu besar (maks {MAX_IMPORT_BYTES // 1024 // 1024} MB).", ephemeral=True)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        store_of, schema, clean = DATASETS[data]
+        if data == "garapan":
+            clean = functools.partial(clean, options=guild_config(self.bot, interaction.guild_id)["kategori"],
+                                      guild_id=interaction.guild_id)
+        raw = await file.read()
+        records, errors = await asyncio.to_thread(validate_rows, read_rows(raw, fmt), clean)
+        # All valid rows go in as one batch: a single write instead of one per row.
+        added = store_of(self.bot, interaction.guild_id).add_many(records)
+
+        message = f"✅ {len(added)} {data} berhasil diimport."
+        files = []
+        if errors:
+            message += f"\n⚠️ {len(errors)} baris dilewati:\n" + "\n".join(errors[:ERROR_PREVIEW])
+            if len(errors) > ERROR_PREVIEW:
+                files.append(discord.File(io.BytesIO("\n".join(errors).encode("utf-8")), "import-error.txt"))
+        await interaction.followup.send(message[:2000], files=files, ephemeral=True)
+
+    @app_commands.command(name="export", description="📤 Export event/garapan ke CSV, JSONL atau kalender .ics")
+    @app_commands.describe(data="Jenis data", format="Format file (ics hanya untuk event)")
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.guild_only()
+    async def cmd_export(self, interaction: Interaction, data: Literal["event", "garapan"],
+                         format: Literal["csv", "jsonl", "ics"] = "csv"):
+        if format == "ics" and data != "event":
+            return await interaction.response.send_message("⚠️ Format ics hanya untuk event.", ephemeral=True)
+        store_of, schema, _ = DATASETS[data]
+        records = store_of(self.bot, interaction.guild_id).load()
+        if not records:
+            return await interaction.response.send_message(f"📭 Tidak ada {data}.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        if format == "ics":
+            parsed = list(event_records(self.bot, interaction.guild_id).values())
+            chunks = iter_ics(event_ics_items(parsed), "Event", event_ics_zones(parsed))
+        else:
+            chunks = EXPORTERS[format](records, ["id"] + schema.fields)
+        # Rows are serialized one by one straight into a temp file off the event loop.
+        f = await asyncio.to_thread(spool, chunks)
+        try:
+            await interaction.followup.send(f"📤 {len(records)} {data} diexport.",
+                                            file=discord.File(f, f"{data}.{format}"), ephemeral=True)
+        finally:
+            f.close()
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(BulkCog(bot))
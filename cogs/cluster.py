@@ -0,0 +1,95 @@
+import asyncio
+import functools
+import sqlite3
+from discord.ext import commands
+from cogs.event import EVENT_SCHEMA
+from cogs.garapan import GARAPAN_SCHEMA
+from utils.guilds import CONFIG_FEED, guild_configs
+from utils.store import get_store, stores
+
+SYNC_INTERVAL = 2.0
+PRUNE_EVERY = 300
+SCHEMAS = {s.name: s for s in (EVENT_SCHEMA, GARAPAN_SCHEMA)}
+
+class ClusterCog(commands.Cog):
+    # Only active when the bot runs under cluster.py (bot.cluster is set).
+    # Every SYNC_INTERVAL it renews/takes the leader lease, publishes the
+    # stores written here and reloads the ones other processes wrote. The
+    # leader also opens stores it doesn't have yet so their deadlines get
+    # scheduled. Guild config changes travel the same feed and arrive as
+    # on_guild_config_changed(guild_id). Leadership changes are dispatched
+    # as on_leadership_changed(leader).
+    def __init__(self, bot):
+        self.bot = bot
+        self.cluster = getattr(bot, "cluster", None)
+        self.pending = set()
+        self.applying = False
+        self.task = None
+        self.watchers = {name: functools.partial(self.track_write, name) for name in SCHEMAS}
+
+    async def cog_load(self):
+        if self.cluster is None:
+            return
+        for name, fn in self.watchers.items():
+            stores(self.bot).watch(name, fn)
+        guild_configs(self.bot).subscribe(self.track_config)
+        self.task = asyncio.create_task(self.run())
+
+    async def cog_unload(self):
+        if self.cluster is None:
+            return
+        self.task.cancel()
+        for fn in self.watchers.values():
+            stores(self.bot).unwatch(fn)
+        guild_configs(self.bot).unsubscribe(self.track_config)
+        if self.cluster.leader:
+            self.cluster.release()
+            self.bot.dispatch("leadership_changed", False)
+
+    def track_write(self, name, guild_id, action, record, old=None):
+        if action not in ("open", "evict") and not self.applying:
+            self.pending.add((name, guild_id))
+
+    def track_config(self, guild_id):
+        self.pending.add((CONFIG_FEED, guild_id))
+
+    async def run(self):
+        ticks = 0
+        while True:
+            try:
+                self.sync(prune=ticks % PRUNE_EVERY == 0)
+            except sqlite3.Error as e:
+                print(f"❌ Cluster sync gagal: {e}")
+            ticks += 1
+            await asyncio.sleep(SYNC_INTERVAL)
+
+    def sync(self, prune=False):
+        was_leader = self.cluster.leader
+        leader = self.cluster.acquire()
+        if self.pending:
+            changed, self.pending = self.pending, set()
+            self.cluster.publish(changed)
+        changes = self.cluster.poll()
+        if any(name == CONFIG_FEED for name, _ in changes):
+            guild_configs(self.bot).reload()
+        for name, guild_id in changes:
+            if name == CONFIG_FEED:
+                self.bot.dispatch("guild_config_changed", guild_id)
+                continue
+            store = stores(self.bot).peek(name, guild_id)
+            self.applying = True
+            try:
+                if store is not None:
+                    store.reload()
+                elif leader:
+                    get_store(self.bot, SCHEMAS[name], guild_id)
+            finally:
+                self.applying = False
+        if leader and prune:
+            self.cluster.prune()
+        if leader != was_leader:
+            print(f"👑 Cluster {self.cluster.cluster_id} {'jadi' if leader else 'bukan lagi'} leader")
+            self.bot.dispatch("leadership_changed", leader)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(ClusterCog(bot))
@@ -0,0 +1,48 @@
+import discord
+from discord import app_commands, Interaction
+from discord.ext import commands
+from utils.guilds import KATEGORI_LIMIT, guild_config, guild_configs
+
+def describe(config):
+    def role(role_id):
+        return f"<@&{role_id}>" if role_id else "-"
+    channel = f"<#{config['reminder_channel']}>" if config["reminder_channel"] else "-"
+    if config["reminder_channel_sbx"]:
+        channel += f" (sbx: <#{config['reminder_channel_sbx']}>)"
+    boards = ", ".join(f"<#{b['channel']}> ({b['tier']})" for b in config["boards"]) or "-"
+    return (f"👥 Role member: {role(config['role_member'])}\n"
+            f"⭐ Role sbx: {role(config['role_sbx'])}\n"
+            f"📋 Kategori garapan: {', '.join(config['kategori'])}\n"
+            f"🔔 Pengingat: {channel} (T-{', T-'.join(map(str, config['reminder_offsets']))} menit)\n"
+            f"📌 Papan event: {boards}")
+
+class ConfigCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="config", description="⚙️ Atur role & kategori garapan server ini")
+    @app_commands.describe(role_member="Role yang bisa melihat event member", role_sbx="Role yang bisa melihat semua event",
+                           kategori="Kategori garapan, pisahkan dengan koma (contoh: Testnet,Depin,Dapps)")
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.guild_only()
+    async def config(self, interaction: Interaction, role_member: discord.Role = None, role_sbx: discord.Role = None,
+                     kategori: str = None):
+        changes = {}
+        if role_member:
+            changes["role_member"] = role_member.id
+        if role_sbx:
+            changes["role_sbx"] = role_sbx.id
+        if kategori is not None:
+            options = list(dict.fromkeys(k.strip()[:100] for k in kategori.split(",") if k.strip()))
+            if not options or len(options) > KATEGORI_LIMIT:
+                return await interaction.response.send_message(
+                    f"⚠️ Kategori harus 1-{KATEGORI_LIMIT} item.", ephemeral=True)
+            changes["kategori"] = options
+        if changes:
+            guild_configs(self.bot).set(interaction.guild_id, **changes)
+        title = "✅ Pengaturan disimpan." if changes else "⚙️ Pengaturan server ini:"
+        await interaction.response.send_message(f"{title}\n{describe(guild_config(self.bot, interaction.guild_id))}",
+                                                ephemeral=True, allowed_mentions=discord.AllowedMentions.none())
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(ConfigCog(bot))
@@ -1,16 +1,26 @@
 import discord
-import json
 import re
 import datetime
-import os
-import pytz
+import heapq
+import time
+from collections import OrderedDict, defaultdict
 from discord import app_commands, Interaction, SelectOption
-from discord.ext import commands, tasks
-from discord.ui import View, Select, Modal, TextInput
+from discord.ext import commands
+from discord.ui import View, Select, Modal, TextInput, Button, DynamicItem
+from utils.calc import Calculator
+from utils.cluster import is_leader
+from utils.records import DEFAULT_ZONE, HARI, Akses, EventRecord, RecordCache, parse_local
+from utils.scheduler import DeadlineScheduler
+from utils.search import SELECT_LIMIT, GuildIndexes, select_prompt
+from utils.guilds import guild_config
+from utils.store import Schema, find, get_store, parse_ref, record_ref, seen_rev, stored_guilds, stores
+from utils.timezones import TIME_ZONES, convert, zone_matches
 
 EVENT_FILE = "events.json"
-ROLE_MEMBER = 1362625935727399022
-ROLE_SBX = 1382262425998594153
+EVENT_WINDOW_DAYS = 30
+EMBED_FIELD_LIMIT = 25
+EMBED_CHAR_LIMIT = 6000
+PAGE_CACHE_SIZE = 8
 
 DATE_REGEX = re.compile(r"^\d{1,2}/\d{1,2}/\d{4}$")
 TIME_REGEX = re.compile(r"^([01]?\d|2[0-3]):[0-5]\d$")
@@ -21,82 +31,154 @@ def valid_dt(s):
     except: return False
 def valid_time(s: str): return bool(TIME_REGEX.match(s))
 
-TIME_ZONES = {
-    "WIB": "Asia/Jakarta", "WITA": "Asia/Makassar", "WIT": "Asia/Jayapura",
-    "EST": "America/New_York", "PST": "America/Los_Angeles", "CET": "Europe/Berlin",
-    "GMT": "GMT", "UTC": "UTC", "AEST": "Australia/Sydney"
-}
-
-def load_events():
-    return json.load(open(EVENT_FILE)) if os.path.exists(EVENT_FILE) else []
-
-def save_events(events):
-    json.dump(events, open(EVENT_FILE, "w"), indent=4)
-
-def is_expired(tanggal, jam):
+def from_ts(ts):
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).replace(tzinfo=None)
+
+def utcnow():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+def upcoming_events(records, now, horizon):
+    # Lazily merges every series' occurrences in [now, horizon) in start
+    # order; now/horizon and the yielded starts are UTC epochs.
+    def expand(i, rec):
+        for ts in rec.window(now, horizon):
+            yield ts, i, rec
+    return heapq.merge(*(expand(i, rec) for i, rec in enumerate(records)))
+
+def repeat_label(rec):
+    if not rec.ulang:
+        return ""
+    label = {1: "harian", 7: "mingguan"}.get(rec.ulang, f"tiap {rec.ulang} hari")
+    return f" 🔁{label}" + (f" s/d {rec.sampai}" if rec.sampai else "")
+
+def event_field(ts, rec):
+    dt = rec.local(ts)
+    value = (f"💬 {rec.sumber}\n{HARI[dt.weekday()]}, {dt:%d/%m/%Y} ⏰{dt:%H:%M} {rec.zona} "
+             f"🔐{rec.akses.label}{repeat_label(rec)}")
+    return rec.nama[:256], value[:1024]
+
+EVENT_SCHEMA = Schema(
+    "events", EVENT_FILE,
+    # tanggal/jam/sampai are local time in `zona` (WIB when missing); hari
+    # is derived from tanggal.
+    fields=["nama", "sumber", "hari", "tanggal", "jam", "akses", "ulang", "sampai", "zona"],
+    # find() looks events up by nama when autocomplete was skipped.
+    indexes=["nama"],
+)
+
+def event_store(bot, guild_id):
+    return get_store(bot, EVENT_SCHEMA, guild_id)
+
+def load_events(bot, guild_id):
+    return event_store(bot, guild_id).load()
+
+def save_events(bot, guild_id, events):
+    event_store(bot, guild_id).save(events)
+
+def record_cache(bot):
+    if not hasattr(bot, "event_records"):
+        bot.event_records = RecordCache(EventRecord.parse)
+        stores(bot).watch(EVENT_SCHEMA.name, bot.event_records.track)
+    return bot.event_records
+
+def event_records(bot, guild_id):
+    # {id: EventRecord} for a guild, parsed once per record revision.
+    return record_cache(bot).records(event_store(bot, guild_id))
+
+def event_record(bot, guild_id, e):
+    # The EventRecord of a store dict (None if it doesn't parse).
+    return record_cache(bot).record(event_store(bot, guild_id), e)
+
+def clean_event(row):
+    # Validates one event (from /input or an import row); the ValueError
+    # message is shown to the user.
+    def text(field):
+        return str(row.get(field) or "").strip()
+    tanggal, jam, sampai = text("tanggal"), text("jam"), text("sampai")
+    zona = text("zona").upper() or DEFAULT_ZONE
+    if not text("nama"):
+        raise ValueError("Nama kosong.")
+    if not valid_date(tanggal):
+        raise ValueError("Tanggal salah (DD/MM/YYYY).")
+    if not valid_time(jam):
+        raise ValueError("Jam salah (HH:MM).")
+    akses = Akses.parse(text("akses"))
+    if sampai and not valid_date(sampai):
+        raise ValueError("Tanggal akhir salah (DD/MM/YYYY).")
+    if sampai and parse_local(sampai) < parse_local(tanggal):
+        raise ValueError("Tanggal akhir tidak boleh sebelum tanggal mulai.")
+    if zona not in TIME_ZONES:
+        raise ValueError(f"Zona harus salah satu dari {', '.join(TIME_ZONES)}.")
     try:
-        dt = datetime.datetime.strptime(f"{tanggal} {jam}", "%d/%m/%Y %H:%M")
-        dt = pytz.utc.localize(dt)
-        return dt < datetime.datetime.now(pytz.utc)
-    except:
-        return False
-
-class DeleteSelect(Select):
-    def __init__(self, events):
-        super().__init__(placeholder="Pilih event untuk dihapus",
-                         custom_id="delete_select",
-                         min_values=1, max_values=1,
-                         options=[SelectOption(label=e["nama"],
-                                               description=f"{e['hari']} {e['tanggal']} ⏰{e['jam']}",
-                                               value=e["nama"]) for e in events])
-        self.events = events
-
-    async def callback(self, ctx: Interaction):
-        name = self.values[0]
-        data = load_events()
-        save_events([e for e in data if e["nama"] != name])
-        await ctx.response.edit_message(content=f"✅ Event **{name}** berhasil dihapus.", view=None)
-
-class DeleteView(View):
-    def __init__(self, events):
-        super().__init__(timeout=None)
-        self.add_item(DeleteSelect(events))
-
-class EventSelect(Select):
-    def __init__(self, events):
-        super().__init__(placeholder="Pilih event untuk edit",
-                         custom_id="edit_event_select",
-                         min_values=1, max_values=1,
-                         options=[SelectOption(label=e["nama"],
-                                               description=f"{e['hari']} {e['tanggal']} ⏰{e['jam']} 🔐{e['akses']}",
-                                               value=e["nama"]) for e in events])
-        self.events = events
+        ulang = int(text("ulang") or 0)
+    except ValueError:
+        ulang = -1
+    if not 0 <= ulang <= 365:
+        raise ValueError("Ulang harus 0-365 hari.")
+    hari = HARI[parse_local(tanggal).weekday()]
+    return {"nama": text("nama"), "sumber": text("sumber"), "hari": hari, "tanggal": tanggal, "jam": jam,
+            "akses": akses.label, "ulang": ulang, "sampai": sampai, "zona": zona}
+
+DELETE_CONFLICT = "⚠️ Event baru saja diubah orang lain. Buka ulang `/eventdelete` lalu coba lagi."
+
+EDIT_FIELDS = ["nama", "sumber", "tanggal", "jam", "zona", "akses", "ulang", "sampai"]
+
+def stateless_view(*items):
+    # Every item is a DynamicItem resolved from its custom_id, so the view
+    # is stopped before sending and never kept in the bot's view store.
+    view = View(timeout=None)
+    for item in items:
+        view.add_item(item)
+    view.stop()
+    return view
+
+class EventPicker(DynamicItem[Select], template=r"event:(?P<action>delete|edit)"):
+    # Option values are record refs; the record is looked up when picked.
+    def __init__(self, action, events=()):
+        verb = "dihapus" if action == "delete" else "diedit"
+        super().__init__(Select(
+            placeholder=f"Pilih event untuk {verb}",
+            custom_id=f"event:{action}",
+            min_values=1, max_values=1,
+            options=[SelectOption(label=e["nama"][:100],
+                                  description=f"{e['hari']} {e['tanggal']} ⏰{e['jam']} 🔐{e['akses']}"[:100],
+                                  value=record_ref(e)) for e in events[:SELECT_LIMIT]]))
+        self.action = action
+
+    @classmethod
+    async def from_custom_id(cls, interaction: Interaction, item, match):
+        return cls(match["action"])
 
     async def callback(self, inter: Interaction):
-        ev = next(e for e in self.events if e["nama"] == self.values[0])
-        await inter.response.send_message("Pilih field untuk diubah:", view=FieldSelectView(ev), ephemeral=True)
-
-class SelectEditView(View):
-    def __init__(self, events):
-        super().__init__(timeout=None)
-        self.add_item(EventSelect(events))
-
-class FieldSelect(Select):
-    def __init__(self, ev):
-        super().__init__(placeholder="Pilih field",
-                         custom_id="field_select",
-                         min_values=1, max_values=1,
-                         options=[SelectOption(label=field.capitalize(), value=field)
-                                  for field in ["nama", "sumber", "hari", "tanggal", "jam", "akses"]])
-        self.ev = ev
+        store = event_store(inter.client, inter.guild_id)
+        value = self.item.values[0]
+        ev = store.get(id=parse_ref(value)[0])
+        if ev is None:
+            return await inter.response.send_message("⚠️ Event sudah tidak ada.", ephemeral=True)
+        if self.action == "delete":
+            if not store.delete(id=ev["id"], rev=seen_rev(value, ev)):
+                return await inter.response.edit_message(content=DELETE_CONFLICT, view=None)
+            return await inter.response.edit_message(content=f"✅ Event **{ev['nama']}** berhasil dihapus.", view=None)
+        await inter.response.send_message("Pilih field untuk diubah:", view=stateless_view(FieldPicker(ev["id"])), ephemeral=True)
+
+class FieldPicker(DynamicItem[Select], template=r"event:field:(?P<id>\d+)"):
+    def __init__(self, event_id):
+        super().__init__(Select(
+            placeholder="Pilih field",
+            custom_id=f"event:field:{event_id}",
+            min_values=1, max_values=1,
+            options=[SelectOption(label=field.capitalize(), value=field) for field in EDIT_FIELDS]))
+        self.event_id = event_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: Interaction, item, match):
+        return cls(int(match["id"]))
 
     async def callback(self, inter: Interaction):
-        await inter.response.send_modal(EditOneFieldModal(self.ev, self.values[0]))
-
-class FieldSelectView(View):
-    def __init__(self, ev):
-        super().__init__(timeout=None)
-        self.add_item(FieldSelect(ev))
+        ev = event_store(inter.client, inter.guild_id).get(id=self.event_id)
+        if ev is None:
+            return await inter.response.send_message("⚠️ Event sudah tidak ada.", ephemeral=True)
+        await inter.response.send_modal(EditOneFieldModal(ev, self.item.values[0]))
 
 class EditOneFieldModal(Modal):
     new_val = TextInput(label="Nilai baru", required=True, min_length=1, max_length=100)
@@ -105,145 +187,313 @@ class EditOneFieldModal(Modal):
         super().__init__(title=f"Edit {field} – {ev['nama']}")
         self.ev = ev
         self.field = field
-        existing = ev[field].lstrip("@") if field == "akses" else ev[field]
-        self.new_val.default = existing
+        existing = str(ev.get(field) or (DEFAULT_ZONE if field == "zona" else ""))
+        self.new_val.default = existing.lstrip("@") if field == "akses" else existing
 
     async def on_submit(self, inter: Interaction):
         val = self.new_val.value.strip()
         f = self.field
-
-        if f == "tanggal" and not valid_date(val):
-            return await inter.response.send_message("⚠️ Format tanggal salah (DD/MM/YYYY)", ephemeral=True)
-        if f == "jam" and not valid_time(val):
-            return await inter.response.send_message("⚠️ Format jam salah (HH:MM)", ephemeral=True)
-        if f == "akses":
-            vv = val.lower()
-            if vv not in ["member", "sbx"]:
-                return await inter.response.send_message("⚠️ Akses harus member atau sbx.", ephemeral=True)
-            val = vv
-
-        data = load_events()
-        for e in data:
-            if e["nama"] == self.ev["nama"]:
-                e[f] = f"@{val}" if f == "akses" else val
-        save_events(data)
+        if f == "sampai" and val == "-":
+            val = ""
+        # The whole record is re-validated so derived fields (hari) follow.
+        try:
+            changes = clean_event({**self.ev, f: val})
+        except ValueError as e:
+            hint = " Isi - untuk menghapus tanggal akhir." if f == "sampai" else ""
+            return await inter.response.send_message(f"⚠️ {e}{hint}", ephemeral=True)
+
+        store = event_store(inter.client, inter.guild_id)
+        # Compare-and-swap against the revision shown when the modal opened.
+        if not store.update(changes, id=self.ev["id"], rev=self.ev["rev"]):
+            if store.get(id=self.ev["id"]) is None:
+                return await inter.response.send_message("⚠️ Event sudah tidak ada.", ephemeral=True)
+            return await inter.response.send_message(
+                "⚠️ Event baru saja diubah orang lain. Buka ulang `/eventedit` lalu coba lagi.", ephemeral=True)
         await inter.response.send_message(f"✅ `{f}` event **{self.ev['nama']}** diperbarui.", ephemeral=True)
 
+class EventPages:
+    # Packs rendered fields into embeds on demand, closing a page at 25
+    # fields or 6000 characters. Built pages are kept for reuse.
+    def __init__(self, fields):
+        self._fields = iter(fields)
+        self._pending = None
+        self._pages = []
+        self.done = False
+
+    def _build_next(self):
+        emb = discord.Embed(title=f"📅 Event List (Page {len(self._pages) + 1})", color=discord.Color.green())
+        size = len(emb.title)
+        while len(emb.fields) < EMBED_FIELD_LIMIT:
+            field = self._pending or next(self._fields, None)
+            self._pending = None
+            if field is None:
+                self.done = True
+                break
+            name, value = field
+            if size + len(name) + len(value) > EMBED_CHAR_LIMIT:
+                self._pending = field
+                break
+            emb.add_field(name=name, value=value, inline=False)
+            size += len(name) + len(value)
+        if emb.fields:
+            self._pages.append(emb)
+
+    def get(self, page):
+        while len(self._pages) <= page and not self.done:
+            self._build_next()
+        return self._pages[page] if page < len(self._pages) else None
+
+class EventPaginator(View):
+    def __init__(self, pages):
+        super().__init__(timeout=120)
+        self.pages = pages
+        self.page = 0
+        self.prev_button = Button(label="◀️", style=discord.ButtonStyle.secondary)
+        self.prev_button.callback = self.make_page_callback(-1)
+        self.next_button = Button(label="▶️", style=discord.ButtonStyle.secondary)
+        self.next_button.callback = self.make_page_callback(1)
+        self.add_item(self.prev_button)
+        self.add_item(self.next_button)
+        self.refresh_buttons()
+
+    def refresh_buttons(self):
+        self.prev_button.disabled = self.page == 0
+        self.next_button.disabled = self.pages.get(self.page + 1) is None
+
+    def make_page_callback(self, step):
+        async def callback(interaction: Interaction):
+            self.page = max(self.page + step, 0)
+            self.refresh_buttons()
+            await interaction.response.edit_message(embed=self.get_embed(), view=self)
+        return callback
+
+    def get_embed(self):
+        return self.pages.get(self.page)
+
 class EventCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.cleanup_expired.start()
-
-    @tasks.loop(seconds=60)
-    async def cleanup_expired(self):
-        data = load_events()
-        new_data = [e for e in data if not is_expired(e["tanggal"], e["jam"])]
-        if len(new_data) != len(data):
-            save_events(new_data)
+        self.expiry = DeadlineScheduler(self.cleanup_expired, name="expiry")
+        # (rendered pages, stale at) keyed by (guild, tier, store version, day).
+        self.page_cache = OrderedDict()
+        self.titles = GuildIndexes("nama")
+        self.calculator = Calculator()
+
+    async def cog_load(self):
+        record_cache(self.bot)
+        stores(self.bot).watch(EVENT_SCHEMA.name, self.track_expiry)
+        stores(self.bot).watch(EVENT_SCHEMA.name, self.titles.track)
+        # Expiry deadlines are kept for every guild, so each store is opened
+        # once here; the LRU releases them again as it fills up.
+        for guild_id in stored_guilds():
+            event_store(self.bot, guild_id)
+        # In a cluster only the leader cleans up; see on_leadership_changed.
+        if is_leader(self.bot):
+            self.expiry.start()
+        # Dynamic items are resolved from their custom_id, so components keep
+        # working across restarts without registering a view per message.
+        self.bot.add_dynamic_items(EventPicker, FieldPicker)
+
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(EventPicker, FieldPicker)
+        self.expiry.stop()
+        self.calculator.close()
+        stores(self.bot).unwatch(self.track_expiry)
+        stores(self.bot).unwatch(self.titles.track)
+
+    def reset_expiry(self, guild_id):
+        now = int(time.time())
+        self.expiry.reset_where(lambda key: key[0] == guild_id,
+                                (((guild_id, rec.id), rec.expiry(now))
+                                 for rec in event_records(self.bot, guild_id).values()))
+
+    def track_expiry(self, guild_id, action, ev, old=None):
+        if action in ("open", "reset"):
+            self.reset_expiry(guild_id)
+        elif action == "evict":
+            # Deadlines stay scheduled (the store is reopened when one fires);
+            # only the rendered pages go.
+            for key in [k for k in self.page_cache if k[0] == guild_id]:
+                del self.page_cache[key]
+        elif action == "delete":
+            self.expiry.cancel((guild_id, ev["id"]))
+        else:
+            rec = event_record(self.bot, guild_id, ev)
+            self.expiry.schedule((guild_id, ev["id"]), rec.expiry(int(time.time())) if rec else None)
+
+    async def cleanup_expired(self, due):
+        # A recurring series only moves on to its next occurrence; the record
+        # is removed once its last occurrence has started.
+        finished, advanced = defaultdict(list), set()
+        for (guild_id, event_id), deadline in due:
+            rec = event_records(self.bot, guild_id).get(event_id)
+            if rec is None:
+                continue
+            nxt = rec.next_start(int(deadline) + 1)
+            if nxt is not None:
+                self.expiry.schedule((guild_id, event_id), nxt)
+                advanced.add(guild_id)
+            else:
+                finished[guild_id].append((event_id, rec.rev))
+        # One removal per guild instead of a store rewrite per event.
+        removed = sum(event_store(self.bot, guild_id).delete_many(keys) for guild_id, keys in finished.items())
+        if removed:
             print("🗑️ Event expired dibersihkan.")
-
-    @cleanup_expired.before_loop
-    async def before_loop(self):
-        await self.bot.wait_until_ready()
+        # Nothing was written for these, but their rendered lists changed.
+        for guild_id in advanced:
+            self.bot.dispatch("events_advanced", guild_id)
 
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.bot.tree.sync()
-        self.bot.add_view(DeleteView(load_events()))
-        self.bot.add_view(SelectEditView(load_events()))
         print(f"✅ Bot siap! Logged in as {self.bot.user}")
 
+    @commands.Cog.listener()
+    async def on_leadership_changed(self, leader):
+        if not leader:
+            return self.expiry.stop()
+        # Pick up whatever other processes wrote while we were following.
+        for guild_id in stored_guilds():
+            self.reset_expiry(guild_id)
+        self.expiry.start()
+
     @app_commands.command(name="convert", description="🕒 Konversi waktu antar zona waktu")
-    @app_commands.describe(dari="Zona waktu sumber", ke="Zona waktu target", jam="HH:MM")
-    async def convert(self, interaction: Interaction, dari: str, ke: str, jam: str):
+    @app_commands.describe(dari="Zona waktu sumber", ke="Zona waktu target (kosongkan untuk semua zona)",
+                           jam="HH:MM", tanggal="DD/MM/YYYY (default hari ini)")
+    async def convert(self, interaction: Interaction, dari: str, jam: str, ke: str = None, tanggal: str = None):
         try:
-            if dari not in TIME_ZONES or ke not in TIME_ZONES:
+            if dari not in TIME_ZONES or (ke is not None and ke not in TIME_ZONES):
                 return await interaction.response.send_message("⚠ Zona waktu tidak valid!", ephemeral=True)
             if not valid_time(jam):
                 return await interaction.response.send_message("⚠ Format waktu salah!", ephemeral=True)
+            if tanggal and not valid_date(tanggal):
+                return await interaction.response.send_message("⚠ Format tanggal salah!", ephemeral=True)
 
-            today = datetime.datetime.now().strftime("%d/%m/%Y")
-            source_dt = datetime.datetime.strptime(f"{today} {jam}", "%d/%m/%Y %H:%M")
-            source_dt = pytz.timezone(TIME_ZONES[dari]).localize(source_dt)
-            target_dt = source_dt.astimezone(pytz.timezone(TIME_ZONES[ke]))
+            tanggal = tanggal or datetime.datetime.now().strftime("%d/%m/%Y")
+            source_dt = datetime.datetime.strptime(f"{tanggal} {jam}", "%d/%m/%Y %H:%M")
+            targets = [ke] if ke else [tz for tz in TIME_ZONES if tz != dari]
+            lines = [f"➡️ Ke {tz} {convert(source_dt, dari, tz).strftime('%d/%m/%Y %H:%M')}" for tz in targets]
 
             await interaction.response.send_message(
                 f"⏱ **Konversi Waktu**\n🔄 Dari {dari} {source_dt.strftime('%d/%m/%Y %H:%M')}\n"
-                f"➡️ Ke {ke} {target_dt.strftime('%d/%m/%Y %H:%M')}", ephemeral=True)
+                + "\n".join(lines), ephemeral=True)
         except Exception as e:
             await interaction.response.send_message(f"⚠ Terjadi kesalahan: {str(e)}", ephemeral=True)
 
     @convert.autocomplete("dari")
     @convert.autocomplete("ke")
     async def autocomplete_tz(self, interaction: Interaction, current: str):
-        return [app_commands.Choice(name=tz, value=tz) for tz in TIME_ZONES if current.lower() in tz.lower()]
+        return [app_commands.Choice(name=tz, value=tz) for tz in zone_matches(current)]
 
     @app_commands.command(name="hitung", description="🔢 Hitung ekspresi matematika.")
     @app_commands.describe(expr="Ekspresi matematika")
     async def hitung(self, interaction: Interaction, expr: str):
         try:
-            result = eval(expr, {"__builtins__": None}, {})
+            result = await self.calculator.calculate(expr)
             await interaction.response.send_message(f"Hasil: `{result:,.0f}`", ephemeral=True)
         except Exception as e:
             await interaction.response.send_message(f"⚠ Terjadi kesalahan: {str(e)}", ephemeral=True)
 
     @app_commands.command(name="input", description="➕ Tambah event baru")
-    @app_commands.describe(nama="Nama", sumber="Sumber", hari="Hari",
-                           tanggal="DD/MM/YYYY", jam="HH:MM", akses="member/sbx")
-    async def cmd_input(self, inter: Interaction, nama: str, sumber: str, hari: str, tanggal: str, jam: str, akses: str):
-        if not valid_date(tanggal): 
-            return await inter.response.send_message("⚠️ Tanggal salah.", ephemeral=True)
-        if not valid_time(jam): 
-            return await inter.response.send_message("⚠️ Jam salah.", ephemeral=True)
-        if akses.lower() not in ["member", "sbx"]:
-            return await inter.response.send_message("⚠️ Akses hanya member atau sbx.", ephemeral=True)
-
-        data = load_events()
-        data.append({
-            "nama": nama.strip(), "sumber": sumber.strip(), "hari": hari.strip(),
-            "tanggal": tanggal, "jam": jam, "akses": f"@{akses.lower()}"
-        })
-        save_events(data)
+    @app_commands.guild_only()
+    @app_commands.describe(nama="Nama", sumber="Sumber",
+                           tanggal="DD/MM/YYYY", jam="HH:MM", akses="member/sbx",
+                           ulang="Ulang tiap N hari (1 = harian, 7 = mingguan)", sampai="Tanggal akhir pengulangan DD/MM/YYYY",
+                           zona="Zona waktu tanggal & jam (default WIB)")
+    async def cmd_input(self, inter: Interaction, nama: str, sumber: str, tanggal: str, jam: str, akses: str,
+                        ulang: app_commands.Range[int, 0, 365] = 0, sampai: str = None, zona: str = DEFAULT_ZONE):
+        try:
+            ev = clean_event({"nama": nama, "sumber": sumber, "tanggal": tanggal, "jam": jam,
+                              "akses": akses, "ulang": ulang, "sampai": sampai, "zona": zona})
+        except ValueError as e:
+            return await inter.response.send_message(f"⚠️ {e}", ephemeral=True)
+
+        event_store(self.bot, inter.guild_id).add(ev)
         await inter.response.send_message(f"✅ Event **{nama}** berhasil ditambahkan.", ephemeral=True)
 
+    @cmd_input.autocomplete("zona")
+    async def autocomplete_zona(self, inter: Interaction, current: str):
+        return [app_commands.Choice(name=tz, value=tz) for tz in zone_matches(current)]
+
     @app_commands.command(name="event", description="📅 Tampilkan daftar event")
+    @app_commands.guild_only()
     async def cmd_event(self, inter: Interaction):
+        config = guild_config(self.bot, inter.guild_id)
         roles = [r.id for r in inter.user.roles]
-        events = load_events()
-        if ROLE_SBX in roles:
-            filtered = events
-        elif ROLE_MEMBER in roles:
-            filtered = [e for e in events if e["akses"] == "@member"]
+        if config["role_sbx"] in roles:
+            tier = Akses.SBX
+        elif config["role_member"] in roles:
+            tier = Akses.MEMBER
         else:
             return await inter.response.send_message("⚠️ Tidak punya akses.", ephemeral=True)
 
-        filtered.sort(key=lambda e: datetime.datetime.strptime(f"{e['tanggal']} {e['jam']}", "%d/%m/%Y %H:%M"))
-
-        if not filtered:
+        pages = self.event_pages(inter.guild_id, tier)
+        if pages.get(0) is None:
             return await inter.response.send_message("📭 Tidak ada event.", ephemeral=True)
-
-        emb = discord.Embed(title="📅 Event List", color=discord.Color.green())
-        for e in filtered:
-            emb.add_field(
-                name=e["nama"],
-                value=f"💬 {e['sumber']}\n{e['hari']}, {e['tanggal']} ⏰{e['jam']} 🔐{e['akses']}",
-                inline=False
-            )
-        await inter.response.send_message(embed=emb, ephemeral=True)
+        if pages.get(1) is None:
+            return await inter.response.send_message(embed=pages.get(0), ephemeral=True)
+        view = EventPaginator(pages)
+        await inter.response.send_message(embed=view.get_embed(), view=view, ephemeral=True)
+
+    def event_pages(self, guild_id, tier):
+        store = event_store(self.bot, guild_id)
+        now = int(time.time())
+        key = (guild_id, tier, store.version, now // 86400)
+        cached = self.page_cache.get(key)
+        if cached is not None and now < cached[1]:
+            self.page_cache.move_to_end(key)
+            return cached[0]
+        # Records in id order: equal start times keep the order they were added.
+        records = [rec for rec in event_records(self.bot, guild_id).values() if rec.akses <= tier]
+        # The list changes once a shown series occurrence starts. Every process
+        # checks that itself: only the leader runs cleanup_expired.
+        starts = [ts for ts in (rec.next_start(now) for rec in records if rec.ulang) if ts is not None]
+        stale_at = min(starts) + 1 if starts else float("inf")
+        upcoming = upcoming_events(records, now, now + EVENT_WINDOW_DAYS * 86400)
+        pages = EventPages(event_field(ts, rec) for ts, _, rec in upcoming)
+        self.page_cache[key] = pages, stale_at
+        while len(self.page_cache) > PAGE_CACHE_SIZE:
+            self.page_cache.popitem(last=False)
+        return pages
 
     @app_commands.command(name="eventdelete", description="🗑️ Hapus event lewat dropdown")
-    async def cmd_eventdelete(self, inter: Interaction):
-        events = load_events()
+    @app_commands.guild_only()
+    @app_commands.describe(nama="Nama event (ketik untuk mencari)")
+    async def cmd_eventdelete(self, inter: Interaction, nama: str = None):
+        if nama:
+            store = event_store(self.bot, inter.guild_id)
+            ev = find(store, nama, "nama")
+            if ev is None:
+                return await inter.response.send_message("⚠️ Event tidak ditemukan.", ephemeral=True)
+            if not store.delete(id=ev["id"], rev=seen_rev(nama, ev)):
+                return await inter.response.send_message(DELETE_CONFLICT, ephemeral=True)
+            return await inter.response.send_message(f"✅ Event **{ev['nama']}** berhasil dihapus.", ephemeral=True)
+        events = load_events(self.bot, inter.guild_id)
         if not events:
             return await inter.response.send_message("📭 Tidak ada event.", ephemeral=True)
-        await inter.response.send_message("Pilih event untuk dihapus:", view=DeleteView(events), ephemeral=True)
+        await inter.response.send_message(select_prompt("Pilih event untuk dihapus", len(events), "nama"),
+                                          view=stateless_view(EventPicker("delete", events)), ephemeral=True)
 
     @app_commands.command(name="eventedit", description="✏️ Edit event dari dropdown")
-    async def cmd_eventedit(self, inter: Interaction):
-        events = load_events()
+    @app_commands.guild_only()
+    @app_commands.describe(nama="Nama event (ketik untuk mencari)")
+    async def cmd_eventedit(self, inter: Interaction, nama: str = None):
+        if nama:
+            ev = find(event_store(self.bot, inter.guild_id), nama, "nama")
+            if ev is None:
+                return await inter.response.send_message("⚠️ Event tidak ditemukan.", ephemeral=True)
+            return await inter.response.send_message("Pilih field untuk diubah:",
+                                                     view=stateless_view(FieldPicker(ev["id"])), ephemeral=True)
+        events = load_events(self.bot, inter.guild_id)
         if not events:
             return await inter.response.send_message("📭 Tidak ada event.", ephemeral=True)
-        await inter.response.send_message("Pilih event untuk diedit:", view=SelectEditView(events), ephemeral=True)
+        await inter.response.send_message(select_prompt("Pilih event untuk diedit", len(events), "nama"),
+                                          view=stateless_view(EventPicker("edit", events)), ephemeral=True)
+
+    @cmd_eventdelete.autocomplete("nama")
+    @cmd_eventedit.autocomplete("nama")
+    async def autocomplete_event(self, inter: Interaction, current: str):
+        return [app_commands.Choice(name=label[:100], value=ref)
+                for ref, label in self.titles.choices(event_store(self.bot, inter.guild_id), current)]
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(EventCog(bot))
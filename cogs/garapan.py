@@ -2,24 +2,83 @@ import discord
 from discord.ext import commands
 from discord import app_commands, Interaction, SelectOption
 from discord.ui import View, Modal, TextInput, Select, Button
-import json
-import os
+from utils.guilds import KATEGORI_OPTIONS, guild_config
+from utils.links import link_key, page_previews, parse_message_link, preview_line
+from utils.search import SELECT_LIMIT, GuildIndexes, select_prompt
+from utils.store import Schema, find, get_store, parse_ref, record_ref, seen_rev, stores
 
 GARAPAN_FILE = "garapan.json"
-KATEGORI_OPTIONS = ["Testnet", "Depin", "Dapps"]
-
-def load_garapan():
-    return json.load(open(GARAPAN_FILE)) if os.path.exists(GARAPAN_FILE) else []
-
-def save_garapan(data):
-    json.dump(data, open(GARAPAN_FILE, "w"), indent=4)
+DELETE_CONFLICT = "⚠️ Garapan baru saja diubah orang lain. Buka ulang `/hapusgarapan` lalu coba lagi."
+
+GARAPAN_SCHEMA = Schema(
+    "garapan", GARAPAN_FILE,
+    # link_* are the ids parsed out of `link` when it is stored.
+    fields=["judul", "kategori", "link", "link_guild", "link_channel", "link_message"],
+    # find() looks garapan up by judul when autocomplete was skipped.
+    indexes=["judul"],
+    nocase=["kategori"],
+)
+
+def garapan_store(bot, guild_id):
+    return get_store(bot, GARAPAN_SCHEMA, guild_id)
+
+def load_garapan(bot, guild_id):
+    return garapan_store(bot, guild_id).load()
+
+def save_garapan(bot, guild_id, data):
+    garapan_store(bot, guild_id).save(data)
+
+def clean_judul(value):
+    judul = str(value or "").strip()
+    if not judul:
+        raise ValueError("Judul kosong.")
+    return judul
+
+def clean_kategori(value, options=KATEGORI_OPTIONS):
+    kategori = {k.lower(): k for k in options}.get(str(value or "").strip().lower())
+    if kategori is None:
+        raise ValueError(f"Kategori harus salah satu dari {', '.join(options)}.")
+    return kategori
+
+def clean_link(value, guild_id=None):
+    # The link plus the ids parsed out of it (link_* fields).
+    link = str(value or "").strip()
+    if not link:
+        raise ValueError("Link kosong.")
+    parsed = parse_message_link(link)
+    if parsed is None:
+        raise ValueError("Link harus link pesan Discord (https://discord.com/channels/...).")
+    if guild_id is not None and parsed.guild_id != guild_id:
+        raise ValueError("Link harus pesan dari server ini.")
+    return {"link": link, "link_guild": parsed.guild_id, "link_channel": parsed.channel_id,
+            "link_message": parsed.message_id}
+
+def clean_garapan(row, options=KATEGORI_OPTIONS, guild_id=None):
+    return {"judul": clean_judul(row.get("judul")), "kategori": clean_kategori(row.get("kategori"), options),
+            **clean_link(row.get("link"), guild_id)}
+
+def clean_field(field, value, options=KATEGORI_OPTIONS, guild_id=None):
+    # Changes for an edit of one field; the other fields are left as they
+    # are, so older records with a plain-text link can still be renamed.
+    if field == "link":
+        return clean_link(value, guild_id)
+    if field == "kategori":
+        return {"kategori": clean_kategori(value, options)}
+    return {"judul": clean_judul(value)}
+
+def garapan_field(idx, item, previews):
+    value = f"Kategori: {item['kategori']}\n🔗 {item['link']}"
+    preview = previews.get(link_key(item))
+    if preview:
+        value += f"\n{preview_line(preview)}"
+    return {"name": f"{idx}. {item['judul']}", "value": value[:1024], "inline": False}
 
 class KategoriSelect(Select):
-    def __init__(self):
+    def __init__(self, options=KATEGORI_OPTIONS):
         super().__init__(
             placeholder="Pilih kategori...",
             min_values=1, max_values=1,
-            options=[SelectOption(label=k, value=k) for k in KATEGORI_OPTIONS],
+            options=[SelectOption(label=k, value=k) for k in options],
             custom_id="kategori_select"
         )
 
@@ -35,13 +94,12 @@ class GarapanInputModal(Modal, title="Tambah Garapan Baru"):
         self.kategori = kategori
 
     async def on_submit(self, interaction: Interaction):
-        data = load_garapan()
-        data.append({
-            "judul": self.judul.value,
-            "kategori": self.kategori,
-            "link": self.link.value
-        })
-        save_garapan(data)
+        try:
+            garapan = clean_garapan({"judul": self.judul.value, "kategori": self.kategori, "link": self.link.value},
+                                    options=[self.kategori], guild_id=interaction.guild_id)
+        except ValueError as e:
+            return await interaction.response.send_message(f"⚠️ {e}", ephemeral=True)
+        garapan_store(interaction.client, interaction.guild_id).add(garapan)
         await interaction.response.send_message(f"✅ Garapan **{self.judul.value}** berhasil ditambahkan!", ephemeral=True)
 
 class HapusSelect(Select):
@@ -49,16 +107,19 @@ class HapusSelect(Select):
         super().__init__(
             placeholder="Pilih garapan yang ingin dihapus",
             min_values=1, max_values=1,
-            options=[SelectOption(label=g["judul"], value=g["judul"]) for g in data],
+            options=[SelectOption(label=g["judul"][:100], value=record_ref(g)) for g in data[:SELECT_LIMIT]],
             custom_id="hapus_select"
         )
-        self.data = data
 
     async def callback(self, interaction: Interaction):
-        title = self.values[0]
-        new_data = [g for g in self.data if g["judul"] != title]
-        save_garapan(new_data)
-        await interaction.response.edit_message(content=f"✅ Garapan **{title}** berhasil dihapus.", view=None)
+        store = garapan_store(interaction.client, interaction.guild_id)
+        value = self.values[0]
+        garapan = store.get(id=parse_ref(value)[0])
+        if garapan is None:
+            return await interaction.response.edit_message(content="⚠️ Garapan sudah tidak ada.", view=None)
+        if not store.delete(id=garapan["id"], rev=seen_rev(value, garapan)):
+            return await interaction.response.edit_message(content=DELETE_CONFLICT, view=None)
+        await interaction.response.edit_message(content=f"✅ Garapan **{garapan['judul']}** berhasil dihapus.", view=None)
 
 class EditFieldSelect(Select):
     def __init__(self, garapan):
@@ -86,136 +147,201 @@ class EditFieldModal(Modal):
         self.new_value.default = garapan[field]
 
     async def on_submit(self, interaction: Interaction):
-        data = load_garapan()
-        for g in data:
-            if g["judul"] == self.garapan["judul"]:
-                g[self.field] = self.new_value.value
-        save_garapan(data)
+        try:
+            changes = clean_field(self.field, self.new_value.value,
+                                  options=guild_config(interaction.client, interaction.guild_id)["kategori"],
+                                  guild_id=interaction.guild_id)
+        except ValueError as e:
+            return await interaction.response.send_message(f"⚠️ {e}", ephemeral=True)
+        store = garapan_store(interaction.client, interaction.guild_id)
+        # Compare-and-swap against the revision the user picked.
+        if not store.update(changes, id=self.garapan["id"], rev=self.garapan["rev"]):
+            if store.get(id=self.garapan["id"]) is None:
+                return await interaction.response.send_message("⚠️ Garapan sudah tidak ada.", ephemeral=True)
+            return await interaction.response.send_message(
+                "⚠️ Garapan baru saja diubah orang lain. Buka ulang `/editgarapan` lalu coba lagi.", ephemeral=True)
         await interaction.response.send_message(f"✅ `{self.field}` garapan **{self.garapan['judul']}** diperbarui.", ephemeral=True)
 
+def partition_kategori(data):
+    # One pass over the list; filters then just pick a prebuilt partition.
+    partitions = {"all": data}
+    for item in data:
+        partitions.setdefault(item["kategori"].lower(), []).append(item)
+    return partitions
+
 class FilterKategoriSelect(Select):
-    def __init__(self, original_data, update_callback):
-        self.original_data = original_data
+    def __init__(self, update_callback, options=KATEGORI_OPTIONS):
         self.update_callback = update_callback
 
         super().__init__(
             placeholder="Filter kategori...",
-            options=[SelectOption(label=k, value=k) for k in KATEGORI_OPTIONS] +
+            options=[SelectOption(label=k, value=k.lower()) for k in options] +
                     [SelectOption(label="(Semua)", value="all")],
             custom_id="filter_kategori"
         )
 
     async def callback(self, interaction: Interaction):
-        val = self.values[0]
-        if val == "all":
-            filtered = self.original_data
-        else:
-            filtered = [g for g in self.original_data if g["kategori"].lower() == val.lower()]
-        await self.update_callback(interaction, filtered)
+        await self.update_callback(interaction, self.values[0])
+
+class JumpPageModal(Modal, title="Lompat ke halaman"):
+    halaman = TextInput(label="Nomor halaman", required=True, max_length=6)
+
+    def __init__(self, paginator):
+        super().__init__()
+        self.paginator = paginator
+        self.halaman.placeholder = f"1-{paginator.max_page + 1}"
+
+    async def on_submit(self, interaction: Interaction):
+        if not self.halaman.value.strip().isdigit():
+            return await interaction.response.send_message("⚠️ Nomor halaman harus angka.", ephemeral=True)
+        await self.paginator.go_to(interaction, int(self.halaman.value) - 1)
 
 class GarapanPaginator(View):
-    def __init__(self, original_data, filtered_data=None, per_page=5):
+    # Fixed set of components (first/prev/jump/next/last + filter) that are
+    # only re-labelled on navigation, so the view stays within Discord's
+    # component limit regardless of how many pages there are.
+    def __init__(self, original_data, per_page=5, kategori=KATEGORI_OPTIONS):
         super().__init__(timeout=120)
-        self.original_data = original_data
-        self.data = filtered_data or original_data
+        self.partitions = partition_kategori(original_data)
+        self.data = original_data
         self.per_page = per_page
         self.page = 0
         self.max_page = max((len(self.data) - 1) // self.per_page, 0)
 
+        self.first_button = self.add_nav_button("⏮️", lambda: 0)
+        self.prev_button = self.add_nav_button("◀️", lambda: self.page - 1)
+        self.jump_button = Button(style=discord.ButtonStyle.primary)
+        self.jump_button.callback = self.open_jump
+        self.add_item(self.jump_button)
+        self.next_button = self.add_nav_button("▶️", lambda: self.page + 1)
+        self.last_button = self.add_nav_button("⏭️", lambda: self.max_page)
+        self.add_item(FilterKategoriSelect(self.apply_filter, kategori))
         self.refresh_buttons()
-        self.add_item(FilterKategoriSelect(self.original_data, self.apply_filter))
 
-    def refresh_buttons(self):
-        self.clear_items()
-        for i in range(self.max_page + 1):
-            button = Button(label=str(i + 1), style=discord.ButtonStyle.secondary)
-            button.callback = self.make_page_callback(i)
-            self.add_item(button)
+    def add_nav_button(self, label, target):
+        button = Button(label=label, style=discord.ButtonStyle.secondary)
 
-    def make_page_callback(self, target_page):
         async def callback(interaction: Interaction):
-            self.page = target_page
-            self.refresh_buttons()
-            self.add_item(FilterKategoriSelect(self.original_data, self.apply_filter))
-            await interaction.response.edit_message(embed=self.get_embed(), view=self)
-        return callback
+            await self.go_to(interaction, target())
+        button.callback = callback
+        self.add_item(button)
+        return button
+
+    def refresh_buttons(self):
+        self.first_button.disabled = self.prev_button.disabled = self.page == 0
+        self.next_button.disabled = self.last_button.disabled = self.page >= self.max_page
+        self.jump_button.label = f"{self.page + 1}/{self.max_page + 1}"
+        self.jump_button.disabled = self.max_page == 0
 
-    def get_embed(self):
+    async def open_jump(self, interaction: Interaction):
+        await interaction.response.send_modal(JumpPageModal(self))
+
+    def page_items(self):
         start = self.page * self.per_page
-        end = start + self.per_page
+        return self.data[start:start + self.per_page]
+
+    async def go_to(self, interaction: Interaction, page):
+        self.page = min(max(page, 0), self.max_page)
+        self.refresh_buttons()
+        previews = await page_previews(interaction.client, interaction.user, self.page_items())
+        await interaction.response.edit_message(embed=self.get_embed(previews), view=self)
+
+    def get_embed(self, previews=None):
         embed = discord.Embed(
             title=f"📋 Garapan (Page {self.page + 1}/{self.max_page + 1})",
             color=discord.Color.teal()
         )
-        for idx, item in enumerate(self.data[start:end], start=start + 1):
-            embed.add_field(
-                name=f"{idx}. {item['judul']}",
-                value=f"Kategori: {item['kategori']}\n🔗 {item['link']}",
-                inline=False
-            )
+        for idx, item in enumerate(self.page_items(), start=self.page * self.per_page + 1):
+            embed.add_field(**garapan_field(idx, item, previews or {}))
         return embed
 
-    async def apply_filter(self, interaction: Interaction, filtered_data):
-        self.data = filtered_data
-        self.page = 0
+    async def apply_filter(self, interaction: Interaction, kategori):
+        self.data = self.partitions.get(kategori, [])
         self.max_page = max((len(self.data) - 1) // self.per_page, 0)
-        self.refresh_buttons()
-        self.add_item(FilterKategoriSelect(self.original_data, self.apply_filter))
-        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+        await self.go_to(interaction, 0)
 
 
 class GarapanCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.titles = GuildIndexes("judul")
+
+    async def cog_load(self):
+        stores(self.bot).watch(GARAPAN_SCHEMA.name, self.titles.track)
+
+    async def cog_unload(self):
+        stores(self.bot).unwatch(self.titles.track)
 
     @app_commands.command(name="listgarapan", description="📄 Tampilkan daftar garapan")
+    @app_commands.guild_only()
     async def listgarapan(self, interaction: Interaction):
-        data = load_garapan()
+        data = load_garapan(self.bot, interaction.guild_id)
         if not data:
             return await interaction.response.send_message("📭 Tidak ada garapan.", ephemeral=True)
 
         if len(data) <= 5:
+            previews = await page_previews(self.bot, interaction.user, data)
             embed = discord.Embed(title="📋 Daftar Garapan", color=discord.Color.blue())
             for idx, item in enumerate(data, start=1):
-                embed.add_field(
-                    name=f"{idx}. {item['judul']}",
-                    value=f"Kategori: {item['kategori']}\n🔗 {item['link']}",
-                    inline=False
-                )
+                embed.add_field(**garapan_field(idx, item, previews))
             await interaction.response.send_message(embed=embed, ephemeral=True)
         else:
-            view = GarapanPaginator(original_data=data)
-            await interaction.response.send_message(embed=view.get_embed(), view=view, ephemeral=True)
+            view = GarapanPaginator(original_data=data,
+                                    kategori=guild_config(self.bot, interaction.guild_id)["kategori"])
+            previews = await page_previews(self.bot, interaction.user, view.page_items())
+            await interaction.response.send_message(embed=view.get_embed(previews), view=view, ephemeral=True)
 
     @app_commands.command(name="inputgarapan", description="➕ Tambah garapan baru")
+    @app_commands.guild_only()
     async def inputgarapan(self, interaction: Interaction):
         view = View()
-        view.add_item(KategoriSelect())
+        view.add_item(KategoriSelect(guild_config(self.bot, interaction.guild_id)["kategori"]))
         await interaction.response.send_message("Pilih kategori untuk garapan:", view=view, ephemeral=True)
 
     @app_commands.command(name="hapusgarapan", description="🗑️ Hapus garapan dari daftar")
-    async def hapusgarapan(self, interaction: Interaction):
-        data = load_garapan()
+    @app_commands.guild_only()
+    @app_commands.describe(judul="Judul garapan (ketik untuk mencari)")
+    async def hapusgarapan(self, interaction: Interaction, judul: str = None):
+        if judul:
+            store = garapan_store(self.bot, interaction.guild_id)
+            garapan = find(store, judul, "judul")
+            if garapan is None:
+                return await interaction.response.send_message("⚠️ Garapan tidak ditemukan.", ephemeral=True)
+            if not store.delete(id=garapan["id"], rev=seen_rev(judul, garapan)):
+                return await interaction.response.send_message(DELETE_CONFLICT, ephemeral=True)
+            return await interaction.response.send_message(f"✅ Garapan **{garapan['judul']}** berhasil dihapus.", ephemeral=True)
+        data = load_garapan(self.bot, interaction.guild_id)
         if not data:
             return await interaction.response.send_message("📭 Tidak ada data garapan.", ephemeral=True)
         view = View()
         view.add_item(HapusSelect(data))
-        await interaction.response.send_message("Pilih garapan yang ingin dihapus:", view=view, ephemeral=True)
+        await interaction.response.send_message(select_prompt("Pilih garapan yang ingin dihapus", len(data), "judul"),
+                                                view=view, ephemeral=True)
 
     @app_commands.command(name="editgarapan", description="✏️ Edit data garapan")
-    async def editgarapan(self, interaction: Interaction):
-        data = load_garapan()
+    @app_commands.guild_only()
+    @app_commands.describe(judul="Judul garapan (ketik untuk mencari)")
+    async def editgarapan(self, interaction: Interaction, judul: str = None):
+        if judul:
+            selected = find(garapan_store(self.bot, interaction.guild_id), judul, "judul")
+            if selected is None:
+                return await interaction.response.send_message("⚠️ Garapan tidak ditemukan.", ephemeral=True)
+            view = View()
+            view.add_item(EditFieldSelect(selected))
+            return await interaction.response.send_message("Pilih field yang ingin diedit:", view=view, ephemeral=True)
+
+        data = load_garapan(self.bot, interaction.guild_id)
         if not data:
             return await interaction.response.send_message("📭 Tidak ada garapan.", ephemeral=True)
 
         select = Select(
             placeholder="Pilih garapan yang ingin diedit",
-            options=[SelectOption(label=g["judul"], value=g["judul"]) for g in data],
+            options=[SelectOption(label=g["judul"][:100], value=record_ref(g)) for g in data[:SELECT_LIMIT]],
             min_values=1, max_values=1
         )
 
         async def callback(inter: Interaction):
-            selected = next(g for g in data if g["judul"] == select.values[0])
+            selected = next(g for g in data if record_ref(g) == select.values[0])
             view = View()
             view.add_item(EditFieldSelect(selected))
             await inter.response.edit_message(content="Pilih field yang ingin diedit:", view=view)
@@ -224,7 +350,14 @@ class GarapanCog(commands.Cog):
 
         view = View()
         view.add_item(select)
-        await interaction.response.send_message("Pilih garapan yang ingin diedit:", view=view, ephemeral=True)
+        await interaction.response.send_message(select_prompt("Pilih garapan yang ingin diedit", len(data), "judul"),
+                                                view=view, ephemeral=True)
+
+    @hapusgarapan.autocomplete("judul")
+    @editgarapan.autocomplete("judul")
+    async def autocomplete_judul(self, interaction: Interaction, current: str):
+        return [app_commands.Choice(name=label[:100], value=ref)
+                for ref, label in self.titles.choices(garapan_store(self.bot, interaction.guild_id), current)]
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(GarapanCog(bot))
@@ -1,41 +1,124 @@
-import discord
-from discord.ext import commands
-from discord import app_commands, Interaction
-
-class InfoCog(commands.Cog):
-    def __init__(self, bot):
-        self.bot = bot
-
-    @app_commands.command(name="help", description="📖 Lihat daftar perintah bot")
-    async def help_cmd(self, interaction: Interaction):
-        help_text = (
-            "**📖 Daftar Perintah:**\n"
-            "🕒 `/convert` – Konversi zona waktu.\n"
-            "🔢 `/hitung` – Hitung ekspresi matematika.\n"
-            "📅 `/input`, `/event`, `/eventedit`, `/eventdelete` – Manajemen event.\n"
-            "📋 `/listgarapan`, `/inputgarapan`, `/editgarapan`, `/hapusgarapan` – Manajemen garapan.\n"
-            "ℹ️ `/about` – Info tentang bot.\n"
-            "📊 `/stats` – Statistik bot."
-        )
-        await interaction.response.send_message(help_text, ephemeral=True)
-
-    @app_commands.command(name="about", description="ℹ️ Tampilkan info tentang bot")
-    async def about_cmd(self, interaction: Interaction):
-        embed = discord.Embed(title="🤖 Tentang Bot", color=discord.Color.blurple())
-        embed.add_field(name="Versi", value="1.0.0", inline=True)
-        embed.add_field(name="Creator", value="Ajoika_Feb & Kucingnya", inline=True)
-        embed.add_field(name="Framework", value="discord.py (Cogs)", inline=False)
-        embed.set_footer(text="Dibuat dengan ❤️ dan kopi")
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-
-    @app_commands.command(name="stats", description="📊 Statistik bot (server & user)")
-    async def stats_cmd(self, interaction: Interaction):
-        total_guilds = len(self.bot.guilds)
-        total_users = len(set(self.bot.get_all_members()))
-        embed = discord.Embed(title="📊 Statistik Bot", color=discord.Color.green())
-        embed.add_field(name="Server", value=str(total_guilds))
-        embed.add_field(name="Pengguna unik", value=str(total_users))
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-
-async def setup(bot: commands.Bot):
-    await bot.add_cog(InfoCog(bot))
+import asyncio
+import discord
+from discord.ext import commands
+from discord import app_commands, Interaction
+from utils.stats import BotStats
+from utils.store import stores
+
+STATS_CHUNK_ON_START = True
+CHUNK_DELAY = 1.0
+
+class InfoCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.stats = BotStats()
+        self.populated = False
+
+    def chunking_enabled(self):
+        return STATS_CHUNK_ON_START and self.bot.intents.members
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # on_ready fires again after reconnects; only the first one seeds.
+        if self.populated:
+            return
+        self.populated = True
+        chunking = self.chunking_enabled()
+        for guild in self.bot.guilds:
+            self.stats.add_guild(guild, chunking=chunking and not guild.chunked)
+        if chunking:
+            asyncio.create_task(self.chunk_guilds())
+
+    async def chunk_guilds(self):
+        for guild in list(self.bot.guilds):
+            if guild.id in self.stats.pending:
+                await self.chunk_guild(guild)
+                await asyncio.sleep(CHUNK_DELAY)
+
+    async def chunk_guild(self, guild):
+        try:
+            await guild.chunk(cache=True)
+        except Exception as e:
+            print(f"❌ Gagal chunk {guild.id}: {e}")
+            return
+        self.stats.guild_chunked(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        chunking = self.chunking_enabled()
+        self.stats.add_guild(guild, chunking=chunking)
+        if chunking:
+            asyncio.create_task(self.chunk_guild(guild))
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.stats.remove_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.stats.member_joined(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload):
+        self.stats.member_left(payload.guild_id, payload.user.id)
+
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction: Interaction, command):
+        self.stats.command_used(command.qualified_name)
+
+    @app_commands.command(name="help", description="📖 Lihat daftar perintah bot")
+    async def help_cmd(self, interaction: Interaction):
+        help_text = (
+            "**📖 Daftar Perintah:**\n"
+            "🕒 `/convert` – Konversi zona waktu.\n"
+            "🔢 `/hitung` – Hitung ekspresi matematika.\n"
+            "📅 `/input`, `/event`, `/eventedit`, `/eventdelete` – Manajemen event.\n"
+            "🔔 `/reminder` – Atur pengingat event.\n"
+            "📌 `/board` – Pasang papan event yang selalu diperbarui (admin).\n"
+            "⚙️ `/config` – Atur role & kategori server ini (admin).\n"
+            "📥 `/import`, `/export` – Import/export event & garapan (CSV, JSONL, .ics).\n"
+            "📋 `/listgarapan`, `/inputgarapan`, `/editgarapan`, `/hapusgarapan` – Manajemen garapan.\n"
+            "ℹ️ `/about` – Info tentang bot.\n"
+            "📊 `/stats` – Statistik bot.\n"
+            "📈 `/metrics` – Metrik performa bot (admin)."
+        )
+        await interaction.response.send_message(help_text, ephemeral=True)
+
+    @app_commands.command(name="about", description="ℹ️ Tampilkan info tentang bot")
+    async def about_cmd(self, interaction: Interaction):
+        embed = discord.Embed(title="🤖 Tentang Bot", color=discord.Color.blurple())
+        embed.add_field(name="Versi", value="1.0.0", inline=True)
+        embed.add_field(name="Creator", value="Ajoika_Feb & Kucingnya", inline=True)
+        embed.add_field(name="Framework", value="discord.py (Cogs)", inline=False)
+        embed.set_footer(text="Dibuat dengan ❤️ dan kopi")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="stats", description="📊 Statistik bot (server & user)")
+    async def stats_cmd(self, interaction: Interaction):
+        stats = self.stats
+        embed = discord.Embed(title="📊 Statistik Bot", color=discord.Color.green())
+        embed.add_field(name="Server", value=str(len(stats.guilds)))
+        if self.bot.intents.members:
+            value = str(stats.unique_members)
+            if stats.pending:
+                value += f" (memuat {len(stats.pending)} server…)"
+            embed.add_field(name="Pengguna unik", value=value)
+        elif interaction.guild_id:
+            # No member events without the intent, so ask Discord for this server's count.
+            try:
+                guild = await self.bot.fetch_guild(interaction.guild_id, with_counts=True)
+                embed.add_field(name="Anggota server ini", value=f"±{guild.approximate_member_count}")
+            except discord.HTTPException:
+                pass
+        embed.add_field(name="Total anggota", value=str(stats.member_total))
+        loaded = stores(self.bot)
+        for store in loaded.values():
+            if store.guild_id == interaction.guild_id:
+                embed.add_field(name=f"Data {store.schema.name}", value=str(store.count()))
+        embed.add_field(name="Store dimuat", value=f"{len(loaded)}/{loaded.capacity}")
+        top = "\n".join(f"`/{name}` – {count}" for name, count in stats.commands.most_common(5))
+        embed.add_field(name=f"Perintah dipakai ({sum(stats.commands.values())})", value=top or "-", inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(InfoCog(bot))
@@ -0,0 +1,102 @@
+import time
+import discord
+from aiohttp import web
+from discord import app_commands, Interaction
+from discord.ext import commands
+from utils.metrics import (command_errors, command_latency, command_timeouts, registry,
+                           scheduler_lag, store_io_bytes, store_io_seconds)
+
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9108
+ACK_WINDOW = 3.0
+UNKNOWN_INTERACTION = 10062
+
+def command_name(interaction: Interaction):
+    return interaction.command.qualified_name if interaction.command else "unknown"
+
+def fmt_quantiles(hist, *labels):
+    p50, p99 = hist.quantile(0.5, *labels), hist.quantile(0.99, *labels)
+    return f"{hist.count(*labels)}x p50≤{p50:g}s p99≤{p99:g}s"
+
+class MetricsCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.runner = None
+
+    async def cog_load(self):
+        # Hook the tree so every app command is timed, not just this cog's.
+        tree = self.bot.tree
+        self._tree_check, tree.interaction_check = tree.interaction_check, self.interaction_check
+        self._tree_error, tree.on_error = tree.on_error, self.on_tree_error
+        await self.start_server()
+
+    async def cog_unload(self):
+        tree = self.bot.tree
+        tree.interaction_check = self._tree_check
+        tree.on_error = self._tree_error
+        if self.runner:
+            await self.runner.cleanup()
+
+    async def start_server(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle_metrics)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        # Each cluster process gets its own port.
+        cluster = getattr(self.bot, "cluster", None)
+        port = METRICS_PORT + (cluster.cluster_id if cluster else 0)
+        try:
+            await web.TCPSite(self.runner, METRICS_HOST, port).start()
+            print(f"📈 Metrics di http://{METRICS_HOST}:{port}/metrics")
+        except OSError as e:
+            print(f"❌ Gagal membuka port metrics {port}: {e}")
+
+    async def handle_metrics(self, request):
+        return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Prometheus-Format": "0.0.4"})
+
+    async def interaction_check(self, interaction: Interaction):
+        interaction.extras["started"] = time.perf_counter()
+        return await self._tree_check(interaction)
+
+    def observe(self, interaction: Interaction):
+        started = interaction.extras.get("started")
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        command_latency.observe(command_name(interaction), value=elapsed)
+        if elapsed > ACK_WINDOW and not interaction.response.is_done():
+            command_timeouts.inc(command_name(interaction))
+
+    async def on_tree_error(self, interaction: Interaction, error):
+        name = command_name(interaction)
+        self.observe(interaction)
+        command_errors.inc(name)
+        original = getattr(error, "original", error)
+        if isinstance(original, discord.NotFound) and original.code == UNKNOWN_INTERACTION:
+            command_timeouts.inc(name)
+        await self._tree_error(interaction, error)
+
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction: Interaction, command):
+        self.observe(interaction)
+
+    @app_commands.command(name="metrics", description="📈 Ringkasan metrik bot (admin)")
+    @app_commands.default_permissions(administrator=True)
+    async def metrics_cmd(self, interaction: Interaction):
+        lines = ["Perintah:"]
+        for (name,) in sorted(command_latency.counts):
+            lines.append(f"  /{name} {fmt_quantiles(command_latency, name)}")
+        lines.append(f"Error: {sum(command_errors.values.values()):g}  "
+                     f"Timeout: {sum(command_timeouts.values.values()):g}")
+        lines.append("Store:")
+        for store, op in sorted(store_io_seconds.counts):
+            kb = store_io_bytes.values.get((store, op), 0) / 1024
+            lines.append(f"  {store} {op} {fmt_quantiles(store_io_seconds, store, op)} {kb:.1f} KB")
+        for (name,) in sorted(scheduler_lag.counts):
+            lines.append(f"Scheduler {name} lag {fmt_quantiles(scheduler_lag, name)}")
+        text = "\n".join(lines)[:1900]
+        await interaction.response.send_message(f"```\n{text}\n```", ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(MetricsCog(bot))
@@ -0,0 +1,133 @@
+import discord
+import time
+from discord import app_commands, Interaction
+from discord.ext import commands
+from cogs.event import EVENT_SCHEMA, HARI, event_record, event_records, event_store, record_cache
+from utils.cluster import is_leader
+from utils.dispatch import DispatchQueue
+from utils.guilds import guild_config, guild_configs
+from utils.records import Akses
+from utils.scheduler import DeadlineScheduler
+from utils.store import stored_guilds, stores
+
+def role_mentions(config):
+    return {f"@{tier}": f"<@&{config[f'role_{tier}']}>" for tier in ("member", "sbx") if config[f"role_{tier}"]}
+
+def reminder_channel(config, rec):
+    if rec.akses == Akses.SBX and config["reminder_channel_sbx"]:
+        return config["reminder_channel_sbx"]
+    return config["reminder_channel"]
+
+class ReminderCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # Keyed by (guild id, event id, minutes before).
+        self.reminders = DeadlineScheduler(self.send_reminders, name="reminder")
+        self.outbox = DispatchQueue(self.send_message)
+
+    async def cog_load(self):
+        # Open stores are scheduled by watch(); the rest through the "open"
+        # notification as each guild's store is opened.
+        record_cache(self.bot)
+        stores(self.bot).watch(EVENT_SCHEMA.name, self.track_event)
+        for guild_id in stored_guilds():
+            event_store(self.bot, guild_id)
+        if is_leader(self.bot):
+            self.reminders.start()
+        self.outbox.start()
+
+    async def cog_unload(self):
+        self.reminders.stop()
+        self.outbox.stop()
+        stores(self.bot).unwatch(self.track_event)
+
+    @commands.Cog.listener()
+    async def on_leadership_changed(self, leader):
+        if not leader:
+            return self.reminders.stop()
+        for guild_id in stored_guilds():
+            self.reschedule_guild(guild_id)
+        self.reminders.start()
+
+    @commands.Cog.listener()
+    async def on_guild_config_changed(self, guild_id):
+        # /reminder ran in another cluster process.
+        if is_leader(self.bot):
+            self.reschedule_guild(guild_id)
+
+    def next_reminder(self, rec, off, after):
+        # Reminder time (UTC epoch) for the first occurrence starting more
+        # than `off` minutes after `after`.
+        ts = rec.next_start(int(after) + off * 60 + 1)
+        return ts - off * 60 if ts is not None else None
+
+    def reschedule_guild(self, guild_id):
+        now = time.time()
+        offsets = guild_config(self.bot, guild_id)["reminder_offsets"]
+        self.reminders.reset_where(
+            lambda key: key[0] == guild_id,
+            (((guild_id, rec.id, off), self.next_reminder(rec, off, now))
+             for rec in event_records(self.bot, guild_id).values()
+             for off in offsets),
+        )
+
+    def track_event(self, guild_id, action, ev, old=None):
+        if action in ("open", "reset"):
+            return self.reschedule_guild(guild_id)
+        if action == "evict":
+            # Reminders keep firing; the store is reopened when one is due.
+            return
+        now = time.time()
+        rec = None if action == "delete" else event_record(self.bot, guild_id, ev)
+        for off in guild_config(self.bot, guild_id)["reminder_offsets"]:
+            due = self.next_reminder(rec, off, now) if rec else None
+            self.reminders.schedule((guild_id, ev["id"], off), due)
+
+    async def send_reminders(self, due):
+        for (guild_id, event_id, off), deadline in due:
+            rec = event_records(self.bot, guild_id).get(event_id)
+            if rec is None:
+                continue
+            # Queue the following occurrence of a recurring series.
+            self.reminders.schedule((guild_id, event_id, off), self.next_reminder(rec, off, deadline))
+            config = guild_config(self.bot, guild_id)
+            channel_id = reminder_channel(config, rec)
+            if not channel_id:
+                continue
+            start = rec.local(int(deadline) + off * 60)
+            mention = role_mentions(config).get(rec.akses.label)
+            self.outbox.put(
+                channel_id,
+                f"🔔 **{rec.nama}** mulai dalam {off} menit – {HARI[start.weekday()]}, {start:%d/%m/%Y} "
+                f"⏰{start:%H:%M} {rec.zona} 💬 {rec.sumber}",
+                [mention] if mention else [],
+            )
+
+    async def send_message(self, channel_id, content):
+        channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+        await channel.send(content, allowed_mentions=discord.AllowedMentions(roles=True))
+
+    @app_commands.command(name="reminder", description="🔔 Atur channel & waktu pengingat event")
+    @app_commands.describe(channel="Channel pengingat", menit="Menit sebelum event, pisahkan dengan koma (contoh: 60,10)",
+                           channel_sbx="Channel khusus pengingat event sbx (kosongkan = pakai channel)")
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.guild_only()
+    async def reminder(self, interaction: Interaction, channel: discord.TextChannel, menit: str = None,
+                       channel_sbx: discord.TextChannel = None):
+        offsets = guild_config(self.bot, interaction.guild_id)["reminder_offsets"]
+        if menit:
+            try:
+                offsets = sorted({int(m) for m in menit.split(",") if m.strip()}, reverse=True)
+            except ValueError:
+                return await interaction.response.send_message("⚠️ Format menit salah (contoh: 60,10).", ephemeral=True)
+            if not offsets or any(m <= 0 for m in offsets):
+                return await interaction.response.send_message("⚠️ Menit harus lebih dari 0.", ephemeral=True)
+        guild_configs(self.bot).set(interaction.guild_id, reminder_channel=channel.id, reminder_offsets=offsets,
+                                    reminder_channel_sbx=channel_sbx.id if channel_sbx else None)
+        self.reschedule_guild(interaction.guild_id)
+        target = channel.mention + (f" (sbx: {channel_sbx.mention})" if channel_sbx else "")
+        await interaction.response.send_message(
+            f"✅ Pengingat dikirim ke {target} pada T-{', T-'.join(map(str, offsets))} menit.", ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(ReminderCog(bot))
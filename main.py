@@ -2,32 +2,76 @@ import discord
 from discord.ext import commands
 import asyncio
 import os
+import time
+from utils.store import close_stores
+from utils.sync import sync_if_changed
 
 
 TOKEN = "Token"
+COG_LOAD_TIMEOUT = 30
+# Privileged intent: it must also be enabled in the Developer Portal or
+# login fails. Without it /stats falls back to Discord's approximate counts.
+MEMBERS_INTENT = os.getenv("MEMBERS_INTENT", "0") == "1"
 
 intents = discord.Intents.default()
+intents.members = MEMBERS_INTENT
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+async def setup_bot(bot):
+    # Runs once per process after login, unlike on_ready which fires
+    # again on every gateway reconnect. In a cluster only the first
+    # process syncs the command tree.
+    cluster = getattr(bot, "cluster", None)
+    if cluster is not None and cluster.cluster_id != 0:
+        return
+    try:
+        await sync_if_changed(bot)
+    except Exception as e:
+        print(f"❌ Gagal sync command: {e}")
 
-async def load_all_cogs():
-    for filename in os.listdir("./cogs"):
-        if filename.endswith(".py") and not filename.startswith("_"):
-            module = f"cogs.{filename[:-3]}"
-            try:
-                await bot.load_extension(module)
-                print(f"✅ Loaded: {module}")
-            except Exception as e:
-                print(f"❌ Gagal load {module}: {e}")
+class EventBot(commands.Bot):
+    async def setup_hook(self):
+        await setup_bot(self)
 
-@bot.event
-async def on_ready():
-    print(f"✅ Bot aktif sebagai {bot.user} (ID: {bot.user.id})")
+class ShardedEventBot(commands.AutoShardedBot):
+    async def setup_hook(self):
+        await setup_bot(self)
 
-async def main():
-    async with bot:
-        await load_all_cogs()
-        await bot.start(TOKEN)
+def create_bot(shard_ids=None, shard_count=None):
+    # Members are chunked in the background by InfoCog instead of blocking startup.
+    if shard_ids is None:
+        bot = EventBot(command_prefix="!", intents=intents, chunk_guilds_at_startup=False)
+    else:
+        bot = ShardedEventBot(command_prefix="!", intents=intents, chunk_guilds_at_startup=False,
+                              shard_ids=shard_ids, shard_count=shard_count)
+
+    async def on_ready():
+        print(f"✅ Bot aktif sebagai {bot.user} (ID: {bot.user.id})")
+    bot.add_listener(on_ready)
+    return bot
+
+async def load_cog(bot, module):
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(bot.load_extension(module), COG_LOAD_TIMEOUT)
+        print(f"✅ Loaded: {module} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    except Exception as e:
+        print(f"❌ Gagal load {module}: {e!r}")
 
-asyncio.run(main())
+async def load_all_cogs(bot):
+    start = time.perf_counter()
+    modules = [f"cogs.{filename[:-3]}" for filename in sorted(os.listdir("./cogs"))
+               if filename.endswith(".py") and not filename.startswith("_")]
+    await asyncio.gather(*(load_cog(bot, m) for m in modules))
+    print(f"✅ {len(modules)} cog dimuat dalam {(time.perf_counter() - start) * 1000:.0f} ms")
+
+async def main(bot=None):
+    bot = bot or create_bot()
+    async with bot:
+        await load_all_cogs(bot)
+        try:
+            await bot.start(TOKEN)
+        finally:
+            await close_stores(bot)
 
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from utils.calc import MAX_EXPONENT, MAX_NODES, CalcError, Calculator, evaluate
+
+
+def test_evaluate_arithmetic():
+    assert evaluate("1 + 2 * 3") == 7
+    assert evaluate("-(2 ** 10) // 3") == -342
+    assert evaluate("7 / 2") == 3.5
+
+
+@pytest.mark.parametrize("expr", [f"2 ** {MAX_EXPONENT + 1}", f"2 ** -{MAX_EXPONENT + 1}"])
+def test_evaluate_exponent_cap(expr):
+    with pytest.raises(CalcError, match="Pangkat"):
+        evaluate(expr)
+
+
+def test_evaluate_result_cap():
+    with pytest.raises(CalcError, match="terlalu besar"):
+        evaluate("99 ** 999")
+    with pytest.raises(CalcError, match="terlalu besar"):
+        evaluate("10 ** 60 * 10 ** 60")
+
+
+def test_evaluate_node_cap():
+    evaluate("+".join(["1"] * (MAX_NODES // 4)))
+    with pytest.raises(CalcError, match="kompleks"):
+        evaluate("+".join(["1"] * MAX_NODES))
+
+
+@pytest.mark.parametrize("expr", ["'a' * 3", "True + 1", "1j * 1j", "x + 1", "abs(-1)", "[1][0]", "(1).real"])
+def test_evaluate_rejects_non_numeric(expr):
+    with pytest.raises(CalcError):
+        evaluate(expr)
+
+
+@pytest.mark.parametrize("expr", ["1 2", "", "1 +"])
+def test_evaluate_rejects_invalid_syntax(expr):
+    with pytest.raises(CalcError, match="tidak valid"):
+        evaluate(expr)
+
+
+def test_calculator_cache_is_keyed_on_parsed_expression():
+    calc = Calculator(workers=1)
+    try:
+        assert asyncio.run(calc.calculate("12")) == 12
+        with pytest.raises(CalcError):
+            asyncio.run(calc.calculate("1 2"))
+        assert asyncio.run(calc.calculate(" 1+ 2 ")) == 3
+        assert asyncio.run(calc.calculate("1 + 2")) == 3
+        assert len(calc.cache) == 2
+    finally:
+        calc.close()
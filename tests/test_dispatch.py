@@ -0,0 +1,34 @@
+import asyncio
+
+from utils.dispatch import DispatchQueue, TokenBucket, build_messages
+
+
+def test_build_messages_packs_under_limit():
+    messages = build_messages(["a" * 6, "b" * 6, "c" * 6], header="@x", limit=18)
+    assert messages == ["@x\naaaaaa\nbbbbbb", "@x\ncccccc"]
+    assert all(len(m) <= 18 for m in messages)
+
+
+def test_build_messages_truncates_long_lines():
+    assert build_messages(["a" * 50], header="@x", limit=20) == ["@x\n" + "a" * 17]
+    assert build_messages([]) == []
+
+
+def test_token_bucket():
+    now = [0.0]
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=lambda: now[0])
+    assert bucket.take() == 0 and bucket.take() == 0
+    assert bucket.take() == 1.0
+    now[0] = 1.0
+    assert bucket.take() == 0
+
+
+def test_dispatch_groups_by_channel_and_mentions():
+    sent = []
+
+    async def send(channel_id, content):
+        sent.append((channel_id, content))
+
+    batch = [(1, "a", ("<@&1>",)), (1, "b", ("<@&2>",)), (1, "c", ("<@&1>",)), (2, "d", ())]
+    asyncio.run(DispatchQueue(send)._dispatch(batch))
+    assert sent == [(1, "<@&1>\na\nc"), (1, "<@&2>\nb"), (2, "d")]
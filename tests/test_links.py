@@ -0,0 +1,65 @@
+import asyncio
+
+import discord
+import pytest
+
+from utils.links import MessageLink, PreviewFetcher, link_key, parse_message_link, to_preview
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://discord.com/channels/1/2/3", MessageLink(1, 2, 3)),
+    ("https://ptb.discord.com/channels/1/2/3/", MessageLink(1, 2, 3)),
+    ("  https://discordapp.com/channels/@me/2/3 ", MessageLink(None, 2, 3)),
+    ("https://discord.com/channels/1/2", None),
+    ("https://example.com/channels/1/2/3", None),
+    ("Tes", None),
+    (None, None),
+])
+def test_parse_message_link(url, expected):
+    assert parse_message_link(url) == expected
+
+
+def test_link_key_filters_guild():
+    stored = {"link": "x", "link_guild": "1", "link_channel": "2", "link_message": "3"}
+    legacy = {"link": "https://discord.com/channels/1/2/3"}
+    assert link_key(stored, 1) == link_key(legacy, 1) == (2, 3)
+    assert link_key(stored, 5) is None
+    assert link_key(legacy, 5) is None
+    assert link_key({"link": "Tes"}) is None
+
+
+def test_to_preview_truncates_snippet():
+    preview = to_preview({"author": {"username": "a"}, "content": "x  y " * 100})
+    assert preview.author == "a"
+    assert len(preview.snippet) == 80 and preview.snippet.endswith("…")
+    assert to_preview({"author": {}, "content": "", "attachments": [{}]}).snippet == "[lampiran]"
+
+
+class FakeHttp:
+    def __init__(self):
+        self.requests = []
+
+    async def get_message(self, channel_id, message_id):
+        self.requests.append((channel_id, message_id))
+        await asyncio.sleep(0)
+        if message_id == 404:
+            raise discord.NotFound(type("R", (), {"status": 404, "reason": "x"})(), "gone")
+        return {"author": {"username": "u"}, "content": f"m{message_id}"}
+
+
+def test_fetcher_caches_and_shares_requests():
+    http = FakeHttp()
+    now = [0.0]
+    fetcher = PreviewFetcher(http, ttl=10, clock=lambda: now[0])
+
+    async def main():
+        first = await asyncio.gather(fetcher.fetch((1, 2)), fetcher.fetch((1, 2)))
+        found = await fetcher.fetch_many([(1, 2), (1, 404)])
+        now[0] = 11
+        await fetcher.fetch((1, 2))
+        return first, found
+
+    first, found = asyncio.run(main())
+    assert first[0].snippet == first[1].snippet == "m2"
+    assert found == {(1, 2): first[0], (1, 404): None}
+    assert http.requests == [(1, 2), (1, 404), (1, 2)]
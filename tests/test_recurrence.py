@@ -0,0 +1,50 @@
+import datetime
+import itertools
+
+from utils.records import EventRecord
+from utils.recurrence import occurrences
+
+DAY = datetime.timedelta(days=1)
+FIRST = datetime.datetime(2026, 3, 1, 19, 0)
+
+
+def event(**fields):
+    return EventRecord.parse({"id": 1, "nama": "x", "tanggal": "01/03/2026", "jam": "19:00",
+                              "akses": "@member", **fields})
+
+
+def test_one_shot():
+    assert list(occurrences(FIRST)) == [FIRST]
+    assert list(occurrences(FIRST, after=FIRST + DAY)) == []
+
+
+def test_series_until_is_inclusive():
+    until = FIRST + 14 * DAY
+    assert list(occurrences(FIRST, 7, until)) == [FIRST, FIRST + 7 * DAY, until]
+
+
+def test_after_skips_to_the_next_occurrence():
+    after = FIRST + 10 * DAY + datetime.timedelta(hours=1)
+    assert next(occurrences(FIRST, 7, after=after)) == FIRST + 14 * DAY
+    assert next(occurrences(FIRST, 7, after=FIRST + 7 * DAY)) == FIRST + 7 * DAY
+
+
+def test_open_ended_series_is_lazy():
+    assert len(list(itertools.islice(occurrences(FIRST, 1), 1000))) == 1000
+
+
+def test_series_keeps_local_hour_across_dst():
+    rec = event(zona="CET", ulang=7, sampai="05/04/2026")
+    hours = [rec.local(ts).hour for ts in rec.occurrences()]
+    assert hours == [19] * 6
+    # Berlin moves to UTC+2 on 29/03/2026: the UTC hour shifts instead.
+    starts = list(rec.occurrences())
+    assert starts[4] - starts[3] == 7 * 86400 - 3600
+
+
+def test_record_expiry():
+    rec = event(zona="UTC", ulang=1, sampai="03/03/2026")
+    starts = list(rec.occurrences())
+    assert len(starts) == 3
+    assert rec.expiry(starts[0] + 1) == starts[1]
+    assert rec.expiry(starts[-1] + 1) == starts[-1] + 1
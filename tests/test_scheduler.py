@@ -0,0 +1,66 @@
+import asyncio
+
+from utils.scheduler import DeadlineScheduler
+
+
+async def nothing(due):
+    pass
+
+
+def test_pop_due_in_deadline_order():
+    scheduler = DeadlineScheduler(nothing)
+    scheduler.schedule("b", 20)
+    scheduler.schedule("a", 10)
+    scheduler.schedule("c", 30)
+    assert scheduler.pop_due(25) == [("a", 10), ("b", 20)]
+    assert scheduler.next_deadline() == 30
+    assert len(scheduler) == 1
+
+
+def test_reschedule_and_cancel_skip_stale_entries():
+    scheduler = DeadlineScheduler(nothing)
+    scheduler.schedule("a", 10)
+    scheduler.schedule("a", 40)
+    scheduler.schedule("b", 20)
+    scheduler.cancel("b")
+    scheduler.schedule("c", None)
+    assert scheduler.pop_due(30) == []
+    assert scheduler.pop_due(40) == [("a", 40)]
+
+
+def test_reset_where_only_touches_matching_keys():
+    scheduler = DeadlineScheduler(nothing)
+    scheduler.schedule((1, "a"), 10)
+    scheduler.schedule((2, "a"), 10)
+    scheduler.reset_where(lambda key: key[0] == 1, [((1, "b"), 5), ((1, "c"), None)])
+    assert scheduler.pop_due(100) == [((1, "b"), 5), ((2, "a"), 10)]
+
+
+def test_heap_is_compacted():
+    scheduler = DeadlineScheduler(nothing)
+    for deadline in range(1000):
+        scheduler.schedule("a", deadline)
+    assert len(scheduler._heap) <= 2 * len(scheduler) + 65
+
+
+def test_run_hands_due_keys_to_callback():
+    now = [100.0]
+    calls = []
+
+    async def on_due(due):
+        calls.append(due)
+
+    async def main():
+        scheduler = DeadlineScheduler(on_due, clock=lambda: now[0])
+        scheduler.schedule("later", 200)
+        scheduler.schedule("now", 90)
+        task = scheduler.start()
+        for _ in range(100):
+            if calls:
+                break
+            await asyncio.sleep(0.01)
+        scheduler.stop()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+    assert calls == [[("now", 90)]]
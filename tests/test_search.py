@@ -0,0 +1,22 @@
+from utils.search import SearchIndex
+
+
+def test_prefix_substring_and_fuzzy():
+    index = SearchIndex()
+    for key, text in enumerate(["Airdrop Zealy", "Node Galxe", "Testnet Quest", "Galxe Mint"]):
+        index.add(key, text)
+    assert index.search("node") == [1]
+    assert index.search("galxe") == [3, 1]
+    assert index.search("tesnet quest")[0] == 2
+    assert index.search("") == [0, 3, 1, 2]
+
+
+def test_add_again_replaces_and_remove_is_final():
+    index = SearchIndex()
+    index.add(1, "Node Mint")
+    index.add(1, "Node Galxe")
+    assert index.label(1) == "Node Galxe"
+    assert index.search("mint") == []
+    index.remove(1)
+    assert len(index) == 0 and index.search("node") == []
+    assert index._grams == {}
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import threading
+
+from utils.store import JsonStore, Schema, SqliteStore, find, parse_ref, record_ref, seen_rev
+
+
+def make_store(tmp_path, **kwargs):
+    return JsonStore(Schema("items", str(tmp_path / "items.json"), fields=["nama"]), **kwargs)
+
+
+def read_file(store):
+    with open(store.path, encoding="utf-8") as f:
+        return [r["nama"] for r in json.load(f)]
+
+
+def test_write_during_flush_reaches_disk(tmp_path):
+    store = make_store(tmp_path, flush_delay=0)
+    writing, release = threading.Event(), threading.Event()
+    write = store._write
+
+    def slow_write(snapshot):
+        writing.set()
+        release.wait(5)
+        write(snapshot)
+
+    store._write = slow_write
+
+    async def main():
+        store.add({"nama": "a"})
+        await asyncio.to_thread(writing.wait, 5)
+        store.add({"nama": "b"})
+        release.set()
+        for _ in range(100):
+            if not store.busy and read_file(store) == ["a", "b"]:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert read_file(store) == ["a", "b"]
+    assert not store.busy
+
+
+def test_failed_flush_is_retried(tmp_path):
+    store = make_store(tmp_path, flush_delay=0)
+    write, calls = store._write, []
+
+    def flaky_write(snapshot):
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        write(snapshot)
+
+    store._write = flaky_write
+
+    async def main():
+        store.add({"nama": "a"})
+        for _ in range(100):
+            if not store.busy:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert len(calls) == 2
+    assert read_file(store) == ["a"]
+
+
+def test_snapshots_are_copy_on_write(tmp_path):
+    store = make_store(tmp_path)
+    store.add({"nama": "a"})
+    before = store.load()
+    store.add({"nama": "b"})
+    store.update({"nama": "c"}, id=1)
+    assert [r["nama"] for r in before] == ["a"]
+    assert [r["nama"] for r in store.load()] == ["c", "b"]
+
+
+def test_update_compare_and_swap(tmp_path):
+    store = make_store(tmp_path)
+    record = store.add({"nama": "a"})
+    assert store.update({"nama": "b"}, id=record["id"], rev=0) == 1
+    assert store.update({"nama": "c"}, id=record["id"], rev=0) == 0
+    assert store.get(id=record["id"]) == {"id": 1, "rev": 1, "nama": "b"}
+
+
+def test_delete_many_skips_changed_records(tmp_path):
+    store = make_store(tmp_path)
+    a, b = store.add({"nama": "a"}), store.add({"nama": "b"})
+    store.update({"nama": "b2"}, id=b["id"])
+    assert store.delete_many([(a["id"], 0), (b["id"], 0)]) == 1
+    assert [r["nama"] for r in store.load()] == ["b2"]
+
+
+def test_json_ids_are_not_reused(tmp_path):
+    store = make_store(tmp_path)
+    store.add({"nama": "a"})
+    last = store.add({"nama": "b"})
+    store.delete(id=last["id"])
+    assert make_store(tmp_path).add({"nama": "c"})["id"] == last["id"] + 1
+
+
+def test_legacy_records_get_ids(tmp_path):
+    (tmp_path / "items.json").write_text(json.dumps([{"nama": "a"}, {"nama": "b"}]), encoding="utf-8")
+    store = make_store(tmp_path)
+    assert [(r["id"], r["rev"]) for r in store.load()] == [(1, 0), (2, 0)]
+    assert store.add({"nama": "c"})["id"] == 3
+
+
+def test_sqlite_ids_are_not_reused(tmp_path):
+    schema = Schema("items", str(tmp_path / "items.json"), fields=["nama"], db_path=str(tmp_path / "bot.db"))
+    store = SqliteStore(schema)
+    store.add({"nama": "a"})
+    last = store.add({"nama": "b"})
+    store.delete(id=last["id"])
+    store.conn.close()
+    store = SqliteStore(schema)
+    assert store.add({"nama": "c"})["id"] == last["id"] + 1
+    assert store.update({"nama": "d"}, id=1, rev=0) == 1
+    assert store.update({"nama": "e"}, id=1, rev=0) == 0
+    store.conn.close()
+
+
+def test_record_refs(tmp_path):
+    store = make_store(tmp_path)
+    record = store.add({"nama": "12"})
+    ref = record_ref(record)
+    assert parse_ref(ref) == (1, 0) and parse_ref("1") == (1, None) and parse_ref("Node") is None
+    assert find(store, ref, "nama") == find(store, "12", "nama") == record
+    store.update({"nama": "b"}, id=1)
+    assert seen_rev(ref, store.get(id=1)) == 0
+    assert seen_rev("b", store.get(id=1)) == 1
+    assert store.delete(id=1, rev=seen_rev(ref, store.get(id=1))) == 0
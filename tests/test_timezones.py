@@ -0,0 +1,32 @@
+import datetime
+
+import pytz
+
+from utils.timezones import ZONES, convert, zone_matches
+
+
+def test_matches_pytz_around_dst():
+    tz = pytz.timezone("Europe/Berlin")
+    for local in (datetime.datetime(2026, 3, 28, 12), datetime.datetime(2026, 3, 29, 12),
+                  datetime.datetime(2026, 10, 25, 12)):
+        expected = tz.localize(local).timestamp()
+        assert ZONES["CET"].to_utc(local) == expected
+        assert ZONES["CET"].from_utc(expected) == local
+
+
+def test_gap_moves_forward_and_ambiguous_is_earlier():
+    cet = ZONES["CET"]
+    gap = cet.to_utc(datetime.datetime(2026, 3, 29, 2, 30))
+    assert cet.from_utc(gap) == datetime.datetime(2026, 3, 29, 3, 30)
+    fold = cet.to_utc(datetime.datetime(2026, 10, 25, 2, 30))
+    assert cet.offset_at(fold) == 7200
+
+
+def test_convert():
+    assert convert(datetime.datetime(2026, 1, 1, 9), "WIB", "WITA") == datetime.datetime(2026, 1, 1, 10)
+    assert convert(datetime.datetime(2026, 7, 1, 12), "UTC", "EST") == datetime.datetime(2026, 7, 1, 8)
+
+
+def test_zone_matches():
+    assert zone_matches("wi") == ["WIB", "WITA", "WIT"]
+    assert zone_matches("xyz") == []
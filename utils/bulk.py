@@ -0,0 +1,158 @@
+import csv
+import datetime
+import io
+import json
+import tempfile
+
+from utils.timezones import EPOCH
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+ICS_LINE_LIMIT = 75
+
+
+def detect_format(filename):
+    for ext, fmt in FORMATS.items():
+        if filename.lower().endswith(ext):
+            return fmt
+    return None
+
+def read_rows(raw, fmt):
+    # Yields (line number, row) lazily; row is None when the line can't be parsed.
+    text = io.TextIOWrapper(io.BytesIO(raw), encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for n, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield n, row if isinstance(row, dict) else None
+
+def validate_rows(rows, clean):
+    # A file that stops decoding (not UTF-8, broken CSV quoting) ends the
+    # import with one error line; rows read before that point are kept.
+    records, errors = [], []
+    n = 0
+    try:
+        for n, row in rows:
+            if row is None:
+                errors.append(f"Baris {n}: format tidak valid.")
+                continue
+            try:
+                records.append(clean(row))
+            except ValueError as e:
+                errors.append(f"Baris {n}: {e}")
+    except UnicodeDecodeError:
+        errors.append(f"Setelah baris {n}: file bukan teks UTF-8." if n else "File bukan teks UTF-8.")
+    except csv.Error as e:
+        errors.append(f"Setelah baris {n}: CSV rusak ({e})." if n else f"CSV rusak ({e}).")
+    return records, errors
+
+
+def iter_csv(records, fields):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(fields)
+    for r in records:
+        writer.writerow(["" if r.get(f) is None else r.get(f) for f in fields])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+def iter_jsonl(records, fields):
+    for r in records:
+        yield json.dumps({f: r.get(f) for f in fields}, ensure_ascii=False) + "\n"
+
+def ics_escape(value):
+    return (str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+def ics_line(line):
+    # Content lines are folded at 75 octets (RFC 5545 3.1) without splitting a UTF-8 sequence.
+    out, size = [], 0
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        if size + n > ICS_LINE_LIMIT:
+            out.append("\r\n ")
+            size = 1
+        out.append(ch)
+        size += n
+    return "".join(out) + "\r\n"
+
+def ics_time(dt):
+    return dt.strftime("%Y%m%dT%H%M%SZ")
+
+def ics_local(dt):
+    return dt.strftime("%Y%m%dT%H%M%S")
+
+def ics_offset(seconds):
+    sign = "-" if seconds < 0 else "+"
+    minutes = abs(int(seconds)) // 60
+    return f"{sign}{minutes // 60:02d}{minutes % 60:02d}"
+
+def iter_vtimezone(zone, since):
+    # VTIMEZONE for a utils.timezones.Zone, from the offset in effect at
+    # `since` (UTC epoch) through the last change in the tz table.
+    yield ics_line("BEGIN:VTIMEZONE")
+    yield ics_line(f"TZID:{zone.name}")
+    for ts, before, after, dst in zone.transitions(since):
+        kind = "DAYLIGHT" if dst else "STANDARD"
+        yield ics_line(f"BEGIN:{kind}")
+        # An observance starts at local time in the offset it replaces.
+        yield ics_line(f"DTSTART:{ics_local(EPOCH + datetime.timedelta(seconds=ts + before))}")
+        yield ics_line(f"TZOFFSETFROM:{ics_offset(before)}")
+        yield ics_line(f"TZOFFSETTO:{ics_offset(after)}")
+        yield ics_line(f"END:{kind}")
+    yield ics_line("END:VTIMEZONE")
+
+def iter_ics(items, name, zones=()):
+    # items: dicts with uid, summary, start and optional description, url,
+    # categories, every (days), until (naive UTC) and tzid. `start` is
+    # naive UTC, or local time in `tzid`, which must be one of `zones`:
+    # (utils.timezones.Zone, earliest start epoch) pairs.
+    yield ics_line("BEGIN:VCALENDAR")
+    yield ics_line("VERSION:2.0")
+    yield ics_line("PRODID:-//eventhelper//bot//ID")
+    yield ics_line(f"X-WR-CALNAME:{ics_escape(name)}")
+    for zone, since in zones:
+        yield from iter_vtimezone(zone, since)
+    stamp = ics_time(datetime.datetime.now(datetime.timezone.utc))
+    for item in items:
+        yield ics_line("BEGIN:VEVENT")
+        yield ics_line(f"UID:{item['uid']}")
+        yield ics_line(f"DTSTAMP:{stamp}")
+        if item.get("tzid"):
+            yield ics_line(f"DTSTART;TZID={item['tzid']}:{ics_local(item['start'])}")
+        else:
+            yield ics_line(f"DTSTART:{ics_time(item['start'])}")
+        yield ics_line(f"SUMMARY:{ics_escape(item['summary'])}")
+        if item.get("description"):
+            yield ics_line(f"DESCRIPTION:{ics_escape(item['description'])}")
+        if item.get("url", "").startswith("http"):
+            yield ics_line(f"URL:{item['url']}")
+        if item.get("categories"):
+            yield ics_line(f"CATEGORIES:{ics_escape(item['categories'])}")
+        if item.get("every"):
+            rule = f"RRULE:FREQ=DAILY;INTERVAL={item['every']}"
+            if item.get("until"):
+                rule += f";UNTIL={ics_time(item['until'])}"
+            yield ics_line(rule)
+        yield ics_line("END:VEVENT")
+    yield ics_line("END:VCALENDAR")
+
+def spool(chunks):
+    # Writes chunks to a temp file as they are produced; the caller sends and closes it.
+    f = tempfile.TemporaryFile()
+    try:
+        for chunk in chunks:
+            f.write(chunk.encode("utf-8"))
+        f.seek(0)
+    except BaseException:
+        f.close()
+        raise
+    return f
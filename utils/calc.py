@@ -0,0 +1,132 @@
+import ast
+import asyncio
+import math
+import multiprocessing
+import operator
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+MAX_LENGTH = 200
+MAX_NODES = 64
+MAX_VALUE = 10 ** 100
+MAX_EXPONENT = 1000
+TIMEOUT = 2.0
+CACHE_SIZE = 256
+WORKERS = 2
+
+BIN_OPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod, ast.Pow: operator.pow,
+}
+UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+class CalcError(ValueError):
+    pass
+
+
+def parse(expr):
+    # Validates in the caller's process so bad input never reaches the pool.
+    if len(expr) > MAX_LENGTH:
+        raise CalcError(f"Ekspresi terlalu panjang (maks {MAX_LENGTH} karakter).")
+    try:
+        tree = ast.parse(expr.strip(), mode="eval")
+    except SyntaxError:
+        raise CalcError("Ekspresi tidak valid.")
+    nodes = 0
+    for node in ast.walk(tree):
+        nodes += 1
+        if nodes > MAX_NODES:
+            raise CalcError("Ekspresi terlalu kompleks.")
+        if isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float):
+                raise CalcError("Hanya angka yang diperbolehkan.")
+        elif not isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, *BIN_OPS, *UNARY_OPS)):
+            raise CalcError("Operasi tidak diperbolehkan.")
+    return tree
+
+
+def _check(value):
+    if isinstance(value, complex):
+        raise CalcError("Hasil bukan bilangan real.")
+    if abs(value) > MAX_VALUE:
+        raise CalcError("Hasil terlalu besar.")
+    return value
+
+
+def _power(base, exp):
+    if abs(exp) > MAX_EXPONENT:
+        raise CalcError(f"Pangkat maksimal {MAX_EXPONENT}.")
+    # Bound the result before computing it: |base|**exp <= MAX_VALUE.
+    if exp > 0 and abs(base) > 1 and exp * math.log10(abs(base)) > math.log10(MAX_VALUE):
+        raise CalcError("Hasil terlalu besar.")
+    return base ** exp
+
+
+def _eval(node):
+    if isinstance(node, ast.Expression):
+        return _eval(node.body)
+    if isinstance(node, ast.Constant):
+        return _check(node.value)
+    if isinstance(node, ast.UnaryOp):
+        return UNARY_OPS[type(node.op)](_eval(node.operand))
+    left, right = _eval(node.left), _eval(node.right)
+    if isinstance(node.op, ast.Pow):
+        return _check(_power(left, right))
+    return _check(BIN_OPS[type(node.op)](left, right))
+
+
+def evaluate(expr):
+    return _eval(parse(expr))
+
+
+class Calculator:
+    # Runs evaluate() in a small process pool with a hard timeout and keeps
+    # an LRU of recent results. A worker that overruns is killed and the
+    # pool is recreated.
+    def __init__(self, workers=WORKERS, timeout=TIMEOUT, cache_size=CACHE_SIZE):
+        self.workers = workers
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            # spawn: never fork the running bot (threads, sockets, event loop).
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _reset_pool(self):
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        # ProcessPoolExecutor cannot cancel a running call; terminate it.
+        for proc in list(getattr(pool, "_processes", {}).values()):
+            proc.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def calculate(self, expr):
+        # Keyed on the parsed tree: "1 2" is a syntax error, not "12".
+        key = ast.dump(parse(expr))
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_pool(), evaluate, expr)
+        try:
+            result = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self._reset_pool()
+            raise CalcError("Perhitungan terlalu lama.")
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,85 @@
+import os
+import socket
+import sqlite3
+import time
+
+CLUSTER_DB = os.getenv("CLUSTER_DB", "cluster.db")
+LEASE_TTL = 15.0
+CHANGE_RETENTION = 3600.0
+
+
+def shard_ranges(shard_count, processes):
+    # Contiguous shard id ranges of near-equal size, one per process.
+    size, extra = divmod(shard_count, processes)
+    ranges, start = [], 0
+    for i in range(processes):
+        end = start + size + (i < extra)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+def is_leader(bot):
+    # Without a cluster the only process is always the leader.
+    cluster = getattr(bot, "cluster", None)
+    return cluster is None or cluster.leader
+
+
+class ClusterState:
+    # Shared SQLite (WAL) db through which the cluster processes coordinate:
+    # a `lease` row naming the leader until `expires`, renewed by its owner,
+    # and a `changes` feed of which (schema, guild) store a process wrote so
+    # the others can drop their caches for it.
+    def __init__(self, cluster_id, path=CLUSTER_DB, ttl=LEASE_TTL, clock=time.time):
+        self.cluster_id = cluster_id
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{cluster_id}"
+        self.ttl = ttl
+        self.clock = clock
+        self.leader = False
+        self.conn = sqlite3.connect(path, timeout=5)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS lease (name TEXT PRIMARY KEY, owner TEXT, expires REAL)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                              "origin TEXT, schema TEXT, guild_id INTEGER, at REAL)")
+        # Older changes are already in the stores this process will open.
+        self.last_seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def acquire(self):
+        # Takes the lease if it is free or expired, renews it if already ours.
+        now = self.clock()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO lease (name, owner, expires) VALUES ('leader', ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires = excluded.expires "
+                "WHERE lease.owner = excluded.owner OR lease.expires < ?",
+                (self.owner, now + self.ttl, now))
+        row = self.conn.execute("SELECT owner FROM lease WHERE name = 'leader'").fetchone()
+        self.leader = row is not None and row[0] == self.owner
+        return self.leader
+
+    def release(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM lease WHERE name = 'leader' AND owner = ?", (self.owner,))
+        self.leader = False
+
+    def publish(self, changed):
+        now = self.clock()
+        with self.conn:
+            self.conn.executemany("INSERT INTO changes (origin, schema, guild_id, at) VALUES (?, ?, ?, ?)",
+                                  [(self.owner, name, guild_id, now) for name, guild_id in changed])
+
+    def poll(self):
+        rows = self.conn.execute("SELECT seq, schema, guild_id FROM changes WHERE seq > ? AND origin != ? "
+                                 "ORDER BY seq", (self.last_seq, self.owner)).fetchall()
+        if rows:
+            self.last_seq = rows[-1][0]
+        return {(name, guild_id) for _, name, guild_id in rows}
+
+    def prune(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM changes WHERE at < ?", (self.clock() - CHANGE_RETENTION,))
+
+    def close(self):
+        if self.leader:
+            self.release()
+        self.conn.close()
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from collections import defaultdict
+
+MESSAGE_LIMIT = 2000
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.stamp = clock()
+
+    def take(self):
+        # Returns 0 when a token was taken, otherwise how long to wait.
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+def build_messages(lines, header="", limit=MESSAGE_LIMIT):
+    # Packs lines into as few messages as possible, repeating the header.
+    messages, current = [], header
+    for line in lines:
+        line = line[:limit - len(header) - 1]
+        if len(current) + len(line) + 1 > limit and current != header:
+            messages.append(current)
+            current = header
+        current = f"{current}\n{line}" if current else line
+    if current != header:
+        messages.append(current)
+    return messages
+
+
+class DispatchQueue:
+    # Single outbound queue: items that arrive within `window` seconds are
+    # coalesced per channel and mention set into as few messages as
+    # possible (a message only pings the roles its lines are for), and each
+    # channel is paced by its own token bucket (Discord allows roughly
+    # 5 messages per 5 seconds per channel).
+    def __init__(self, send, window=2.0, rate=1.0, burst=5):
+        self.send = send
+        self.window = window
+        self.rate = rate
+        self.burst = burst
+        self._queue = asyncio.Queue()
+        self._buckets = {}
+        self._task = None
+
+    def put(self, channel_id, line, mentions=()):
+        self._queue.put_nowait((channel_id, line, tuple(mentions)))
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    def _bucket(self, channel_id):
+        if channel_id not in self._buckets:
+            self._buckets[channel_id] = TokenBucket(self.rate, self.burst)
+        return self._buckets[channel_id]
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self.window)
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch):
+        lines = defaultdict(list)
+        for channel_id, line, ms in batch:
+            lines[channel_id, ms].append(line)
+        for (channel_id, ms), group in lines.items():
+            header = " ".join(dict.fromkeys(ms))
+            bucket = self._bucket(channel_id)
+            for content in build_messages(group, header):
+                while (wait := bucket.take()) > 0:
+                    await asyncio.sleep(wait)
+                try:
+                    await self.send(channel_id, content)
+                except Exception as e:
+                    print(f"❌ Gagal kirim ke channel {channel_id}: {e}")
@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+GUILD_FILE = "guilds.json"
+# Name under which config changes go on the cluster change feed.
+CONFIG_FEED = "guilds"
+# The community the bot was written for: its data stays in the top-level
+# files and it keeps the role ids and reminder settings it had before
+# per-guild config existed.
+LEGACY_GUILD_ID = int(os.getenv("LEGACY_GUILD_ID", "1036563469106954270"))
+ROLE_MEMBER = 1362625935727399022
+ROLE_SBX = 1382262425998594153
+KATEGORI_OPTIONS = ["Testnet", "Depin", "Dapps"]
+KATEGORI_LIMIT = 24
+REMINDER_FILE = "reminder.json"
+REMINDER_OFFSETS = [60, 10]
+
+DEFAULT_CONFIG = {
+    "role_member": None, "role_sbx": None, "kategori": KATEGORI_OPTIONS,
+    "reminder_channel": None, "reminder_offsets": REMINDER_OFFSETS,
+    # Optional separate channel for sbx-only reminders; None = reminder_channel.
+    "reminder_channel_sbx": None,
+    # Pinned event boards: [{"channel": id, "tier": "member"/"sbx", "message": id}].
+    "boards": [],
+}
+
+def legacy_config():
+    config = {"role_member": ROLE_MEMBER, "role_sbx": ROLE_SBX}
+    if os.path.exists(REMINDER_FILE):
+        with open(REMINDER_FILE, encoding="utf-8") as f:
+            old = json.load(f)
+        config["reminder_channel"] = old.get("channel_id")
+        config["reminder_offsets"] = old.get("offsets", REMINDER_OFFSETS)
+    return config
+
+class GuildConfigs:
+    # A few settings per guild, so all of them stay in memory in one file.
+    # Several processes may share the file (cluster.py): set() re-reads it
+    # under an exclusive lock and only changes its own guild, and listeners
+    # (the cluster feed) hear about every change so others can reload().
+    def __init__(self, path=GUILD_FILE):
+        self.path = path
+        self.listeners = []
+        self.configs = self._read()
+        self.legacy = legacy_config()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def reload(self):
+        self.configs = self._read()
+
+    def subscribe(self, fn):
+        self.listeners.append(fn)
+
+    def unsubscribe(self, fn):
+        if fn in self.listeners:
+            self.listeners.remove(fn)
+
+    def get(self, guild_id):
+        config = dict(DEFAULT_CONFIG)
+        if guild_id == LEGACY_GUILD_ID:
+            config.update(self.legacy)
+        config.update(self.configs.get(str(guild_id), {}))
+        return config
+
+    def set(self, guild_id, **changes):
+        with open(f"{self.path}.lock", "a") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            configs = self._read()
+            configs.setdefault(str(guild_id), {}).update(changes)
+            folder = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=".json")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(configs, f, indent=4)
+            os.replace(tmp, self.path)
+        self.configs = configs
+        for fn in self.listeners:
+            fn(guild_id)
+
+def guild_configs(bot):
+    if not hasattr(bot, "guild_configs"):
+        bot.guild_configs = GuildConfigs()
+    return bot.guild_configs
+
+def guild_config(bot, guild_id):
+    return guild_configs(bot).get(guild_id)
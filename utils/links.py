@@ -0,0 +1,168 @@
+import asyncio
+import datetime
+import re
+import time
+from collections import OrderedDict, namedtuple
+
+import discord
+
+from utils.metrics import preview_lookups
+
+PREVIEW_TTL = 300
+PREVIEW_CACHE_SIZE = 512
+PREVIEW_TIMEOUT = 1.5
+SNIPPET_LIMIT = 80
+
+MESSAGE_LINK_REGEX = re.compile(
+    r"^https?://(?:(?:ptb|canary)\.)?discord(?:app)?\.com/channels/(\d+|@me)/(\d+)/(\d+)/?$")
+
+MessageLink = namedtuple("MessageLink", ["guild_id", "channel_id", "message_id"])
+MessagePreview = namedtuple("MessagePreview", ["author", "snippet", "timestamp"])
+
+
+def parse_message_link(url):
+    # "https://discord.com/channels/<guild>/<channel>/<message>" -> MessageLink;
+    # guild_id is None for DM links. None when it isn't a message link.
+    m = MESSAGE_LINK_REGEX.match(str(url or "").strip())
+    if not m:
+        return None
+    guild, channel, message = m.groups()
+    return MessageLink(None if guild == "@me" else int(guild), int(channel), int(message))
+
+def to_preview(payload):
+    # Raw message JSON (GET /channels/{channel}/messages/{message}) -> MessagePreview.
+    author = payload.get("author") or {}
+    snippet = " ".join((payload.get("content") or "").split())
+    if not snippet and (payload.get("attachments") or payload.get("embeds")):
+        snippet = "[lampiran]"
+    if len(snippet) > SNIPPET_LIMIT:
+        snippet = snippet[:SNIPPET_LIMIT - 1] + "…"
+    return MessagePreview(
+        author.get("global_name") or author.get("username") or "?",
+        snippet,
+        datetime.datetime.fromisoformat(payload["timestamp"]) if payload.get("timestamp") else None,
+    )
+
+
+class PreviewFetcher:
+    # Message previews keyed by (channel id, message id), cached for `ttl`
+    # seconds in an LRU of `size` entries. Concurrent lookups of the same
+    # message share one request, and fetch_many() requests all uncached
+    # messages of a page at once. `http` only needs an async
+    # get_message(channel_id, message_id) returning the raw message JSON –
+    # bot.http in production, a local fake in tests.
+    def __init__(self, http, ttl=PREVIEW_TTL, size=PREVIEW_CACHE_SIZE, clock=time.monotonic):
+        self.http = http
+        self.ttl = ttl
+        self.size = size
+        self.clock = clock
+        self._cache = OrderedDict()
+        self._inflight = {}
+
+    def __len__(self):
+        return len(self._cache)
+
+    def peek(self, key):
+        # (found, preview); found is False for missing or expired entries.
+        entry = self._cache.get(key)
+        if entry is None or entry[0] <= self.clock():
+            return False, None
+        self._cache.move_to_end(key)
+        return True, entry[1]
+
+    def _store(self, key, preview):
+        self._cache[key] = (self.clock() + self.ttl, preview)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.size:
+            self._cache.popitem(last=False)
+
+    async def _fetch(self, key):
+        try:
+            payload = await self.http.get_message(*key)
+        except (discord.NotFound, discord.Forbidden):
+            # Deleted or unreadable messages are cached as "no preview" too.
+            preview_lookups.inc("missing")
+            preview = None
+        except Exception as e:
+            # Anything else (5xx, network) is retried on the next lookup.
+            preview_lookups.inc("error")
+            print(f"❌ Gagal ambil pesan {key[1]}: {e}")
+            return None
+        else:
+            preview_lookups.inc("miss")
+            preview = to_preview(payload)
+        self._store(key, preview)
+        return preview
+
+    def _task(self, key):
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._fetch(key))
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def fetch(self, key):
+        return (await self.fetch_many([key])).get(key)
+
+    async def fetch_many(self, keys, timeout=None):
+        # {key: preview} for the keys that resolved within `timeout`; the rest
+        # keep loading in the background and land in the cache for next time.
+        found, pending = {}, {}
+        for key in dict.fromkeys(keys):
+            hit, preview = self.peek(key)
+            if hit:
+                preview_lookups.inc("hit")
+                found[key] = preview
+            else:
+                pending[key] = self._task(key)
+        if pending:
+            await asyncio.wait(pending.values(), timeout=timeout)
+            for key, task in pending.items():
+                if task.done() and not task.cancelled():
+                    found[key] = task.result()
+        return found
+
+
+def link_key(item, guild_id=None):
+    # (channel id, message id) of a garapan link, or None for other links
+    # and, when `guild_id` is given, for links into another guild.
+    # SQLite hands the ids back as text, and records from before the ids
+    # were stored only have the link.
+    if item.get("link_message"):
+        link = MessageLink(int(item["link_guild"]) if item.get("link_guild") else None,
+                           int(item["link_channel"]), int(item["link_message"]))
+    else:
+        link = parse_message_link(item.get("link"))
+    if link is None or (guild_id is not None and link.guild_id != guild_id):
+        return None
+    return link.channel_id, link.message_id
+
+def previews(bot):
+    if not hasattr(bot, "previews"):
+        bot.previews = PreviewFetcher(bot.http)
+    return bot.previews
+
+def can_read(member, channel_id):
+    # Previews are fetched with the bot's permissions, so only show them
+    # to members who could read the linked channel's history themselves.
+    channel = member.guild.get_channel_or_thread(channel_id)
+    if channel is None:
+        return False
+    perms = channel.permissions_for(member)
+    return perms.view_channel and perms.read_message_history
+
+async def page_previews(bot, member, items, timeout=PREVIEW_TIMEOUT):
+    # Only links into the member's guild, in channels they can read, are
+    # fetched; the rest are shown as bare links.
+    keys = [k for k in (link_key(item, member.guild.id) for item in items) if k and can_read(member, k[0])]
+    if not keys:
+        return {}
+    return await previews(bot).fetch_many(keys, timeout=timeout)
+
+def preview_line(preview):
+    line = f"💬 **{preview.author}**"
+    if preview.snippet:
+        line += f": {preview.snippet}"
+    if preview.timestamp:
+        line += f" · <t:{int(preview.timestamp.timestamp())}:R>"
+    return line
@@ -0,0 +1,138 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 3.0, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class Metric:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        # Store writes happen on worker threads too.
+        self._lock = threading.Lock()
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self.values = defaultdict(float)
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self.values[labels] += amount
+
+    def render(self):
+        for labels, value in sorted(self.values.items()):
+            yield f"{self.name}{_labels(self.labels, labels)} {value:g}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *labels, value):
+        with self._lock:
+            self.values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        self.counts = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+        self.sums = defaultdict(float)
+
+    def observe(self, *labels, value):
+        with self._lock:
+            self.counts[labels][bisect_left(self.buckets, value)] += 1
+            self.sums[labels] += value
+
+    def count(self, *labels):
+        return sum(self.counts.get(labels, ()))
+
+    def quantile(self, q, *labels):
+        # Upper bound of the bucket holding the q-th observation.
+        counts = self.counts.get(labels)
+        if not counts or not sum(counts):
+            return None
+        target = q * sum(counts)
+        seen = 0
+        for bound, n in zip(self.buckets + (math.inf,), counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return math.inf
+
+    def render(self):
+        for labels in sorted(self.counts):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), self.counts[labels]):
+                cumulative += n
+                le = "+Inf" if bound == math.inf else f"{bound:g}"
+                yield f"{self.name}_bucket{_labels(self.labels + ('le',), labels + (le,))} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, labels)} {self.sums[labels]:g}"
+            yield f"{self.name}_count{_labels(self.labels, labels)} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for m in self.metrics:
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def timed(histogram, *labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(*labels, value=time.perf_counter() - start)
+
+
+registry = Registry()
+
+command_latency = registry.register(Histogram(
+    "bot_command_latency_seconds", "App command handling time.", ["command"]))
+command_errors = registry.register(Counter(
+    "bot_command_errors_total", "App command errors.", ["command"]))
+command_timeouts = registry.register(Counter(
+    "bot_command_timeouts_total", "Interactions that missed the 3s ack window.", ["command"]))
+store_io_seconds = registry.register(Histogram(
+    "bot_store_io_seconds", "Store load/save duration.", ["store", "op"]))
+store_io_bytes = registry.register(Counter(
+    "bot_store_io_bytes_total", "Bytes read/written by stores.", ["store", "op"]))
+scheduler_lag = registry.register(Histogram(
+    "bot_scheduler_lag_seconds", "Delay between a deadline and its handling.", ["scheduler"]))
+preview_lookups = registry.register(Counter(
+    "bot_link_previews_total", "Garapan link preview lookups.", ["result"]))
+board_updates = registry.register(Counter(
+    "bot_board_updates_total", "Event board refreshes by outcome.", ["result"]))
@@ -0,0 +1,153 @@
+import datetime
+import enum
+
+from utils.recurrence import occurrences
+from utils.timezones import ZONES
+
+DEFAULT_ZONE = "WIB"
+HARI = ["senin", "selasa", "rabu", "kamis", "jumat", "sabtu", "minggu"]
+
+
+class Akses(enum.IntEnum):
+    # Ordered by reach: a tier sees every event with akses <= tier.
+    MEMBER = 1
+    SBX = 2
+
+    @property
+    def label(self):
+        return f"@{self.name.lower()}"
+
+    @classmethod
+    def parse(cls, text):
+        try:
+            return cls[str(text or "").strip().lstrip("@").upper()]
+        except KeyError:
+            raise ValueError("Akses hanya member atau sbx.") from None
+
+
+def parse_local(tanggal, jam="00:00"):
+    return datetime.datetime.strptime(f"{tanggal} {jam}", "%d/%m/%Y %H:%M")
+
+
+class EventRecord:
+    # Parsed form of an event dict. tanggal/jam are local time in `zona`;
+    # `start` (first occurrence) and `until` (end of the last day of a
+    # series) are UTC epoch seconds, so ordering and expiry are plain
+    # integer comparisons.
+    __slots__ = ("id", "rev", "nama", "sumber", "zona", "akses", "ulang", "start", "until")
+
+    def __init__(self, id, rev, nama, sumber, zona, akses, ulang, start, until=None):
+        self.id = id
+        self.rev = rev
+        self.nama = nama
+        self.sumber = sumber
+        self.zona = zona
+        self.akses = akses
+        self.ulang = ulang
+        self.start = start
+        self.until = until
+
+    @classmethod
+    def parse(cls, e):
+        # None for records that can't be parsed; those are skipped like before.
+        zona = e.get("zona") or DEFAULT_ZONE
+        try:
+            zone = ZONES[zona]
+            start = int(zone.to_utc(parse_local(e["tanggal"], e["jam"])))
+            akses = Akses.parse(e.get("akses"))
+        except (KeyError, ValueError):
+            return None
+        try:
+            ulang = int(e.get("ulang") or 0)
+        except ValueError:
+            ulang = 0
+        try:
+            until = int(zone.to_utc(parse_local(e["sampai"], "23:59"))) if e.get("sampai") else None
+        except ValueError:
+            until = None
+        return cls(e.get("id"), e.get("rev", 0), e.get("nama", ""), e.get("sumber", ""), zona, akses, ulang,
+                   start, until)
+
+    def local(self, ts):
+        return ZONES[self.zona].from_utc(ts)
+
+    @property
+    def sampai(self):
+        return f"{self.local(self.until):%d/%m/%Y}" if self.until is not None else ""
+
+    def occurrences(self, after=None):
+        # Start epochs at or after `after`. A series repeats on the local
+        # wall clock, so it keeps its hour across DST changes.
+        if self.until is not None and self.start > self.until:
+            return
+        if not self.ulang:
+            if after is None or self.start >= after:
+                yield self.start
+            return
+        zone = ZONES[self.zona]
+        local = occurrences(zone.from_utc(self.start), self.ulang,
+                            zone.from_utc(self.until) if self.until is not None else None,
+                            zone.from_utc(after) if after is not None else None)
+        for dt in local:
+            ts = int(zone.to_utc(dt))
+            if after is None or ts >= after:
+                yield ts
+
+    def next_start(self, after):
+        return next(self.occurrences(after), None)
+
+    def expiry(self, now):
+        # Deadline of the current occurrence; a finished series expires right away.
+        ts = self.next_start(now)
+        return now if ts is None else ts
+
+    def window(self, after, before):
+        # Occurrences in [after, before), but always at least the next one.
+        # One-shot events stay visible until they are cleaned up.
+        for i, ts in enumerate(self.occurrences(after if self.ulang else None)):
+            if i and ts >= before:
+                return
+            yield ts
+
+
+class RecordCache:
+    # Parsed copies of one schema's records per guild ({guild: {id: parsed}}),
+    # kept in step with the stores through StoreCache.watch(). Each record
+    # revision is parsed once; records that don't parse are left out.
+    def __init__(self, parse):
+        self.parse = parse
+        self.guilds = {}
+
+    def records(self, store):
+        records = self.guilds.get(store.guild_id)
+        if records is None:
+            records = self.guilds[store.guild_id] = {}
+            for r in store.load():
+                self._put(records, r)
+        return records
+
+    def record(self, store, r):
+        records = self.records(store)
+        parsed = records.get(r["id"])
+        if parsed is None or parsed.rev != r["rev"]:
+            parsed = self._put(records, r)
+        return parsed
+
+    def _put(self, records, r):
+        parsed = self.parse(r)
+        if parsed is None:
+            records.pop(r["id"], None)
+        else:
+            records[r["id"]] = parsed
+        return parsed
+
+    def track(self, guild_id, action, r, old=None):
+        records = self.guilds.get(guild_id)
+        if records is None or action == "open":
+            return
+        if action in ("reset", "evict"):
+            del self.guilds[guild_id]
+        elif action == "delete":
+            records.pop(r["id"], None)
+        elif (parsed := records.get(r["id"])) is None or parsed.rev != r["rev"]:
+            self._put(records, r)
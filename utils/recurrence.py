@@ -0,0 +1,21 @@
+import datetime
+
+
+def occurrences(first, every_days=0, until=None, after=None):
+    # Lazily yields the start datetimes of a series: `first`, then every
+    # `every_days` days up to and including `until`. Occurrences before
+    # `after` are skipped arithmetically, never iterated.
+    if until is not None and first > until:
+        return
+    if not every_days:
+        if after is None or first >= after:
+            yield first
+        return
+    step = datetime.timedelta(days=every_days)
+    current = first
+    if after is not None and after > first:
+        current = first + -(-(after - first) // step) * step
+    while until is None or current <= until:
+        yield current
+        current += step
+
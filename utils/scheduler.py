@@ -0,0 +1,101 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+from utils.metrics import scheduler_lag
+
+
+class DeadlineScheduler:
+    # Min-heap of (deadline, seq, key). The loop sleeps until the earliest
+    # deadline (or until an earlier one is scheduled) and hands only the due
+    # (key, deadline) pairs to on_due. Rescheduled or cancelled keys leave stale heap entries
+    # that are skipped when popped and compacted when they pile up.
+    def __init__(self, on_due, clock=time.time, name="scheduler"):
+        self.on_due = on_due
+        self.name = name
+        self.clock = clock
+        self._heap = []
+        self._current = {}
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self._current)
+
+    def schedule(self, key, deadline):
+        if deadline is None:
+            return self.cancel(key)
+        if self._current.get(key) == deadline:
+            return
+        self._current[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._seq), key))
+        self._compact()
+        if deadline <= self.next_deadline():
+            self._wake.set()
+
+    def cancel(self, key):
+        self._current.pop(key, None)
+        self._compact()
+
+    def reset(self, items):
+        self._current = {k: d for k, d in items if d is not None}
+        self._heap = [(d, next(self._seq), k) for k, d in self._current.items()]
+        heapq.heapify(self._heap)
+        self._wake.set()
+
+    def reset_where(self, pred, items):
+        # reset() limited to the keys matching pred (e.g. one guild's).
+        current = {k: d for k, d in self._current.items() if not pred(k)}
+        current.update((k, d) for k, d in items if d is not None)
+        self.reset(current.items())
+
+    def next_deadline(self):
+        while self._heap and self._current.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _compact(self):
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self.reset(self._current.items())
+
+    def pop_due(self, now):
+        due = []
+        while (deadline := self.next_deadline()) is not None and deadline <= now:
+            _, _, key = heapq.heappop(self._heap)
+            del self._current[key]
+            due.append((key, deadline))
+        return due
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    async def _run(self):
+        while True:
+            deadline = self.next_deadline()
+            timeout = None if deadline is None else max(deadline - self.clock(), 0)
+            if timeout != 0:
+                self._wake.clear()
+                # asyncio.wait, unlike wait_for, never swallows a cancel
+                # that races a wake-up, so stop() and shutdown always land.
+                waiter = asyncio.ensure_future(self._wake.wait())
+                try:
+                    await asyncio.wait([waiter], timeout=timeout)
+                finally:
+                    waiter.cancel()
+                continue
+            now = self.clock()
+            due = self.pop_due(now)
+            if due:
+                scheduler_lag.observe(self.name, value=max(now - due[0][1], 0))
+                try:
+                    await self.on_due(due)
+                except Exception as e:
+                    print(f"❌ Scheduler error: {e}")
@@ -0,0 +1,139 @@
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+
+from utils.store import record_ref
+
+SELECT_LIMIT = 25
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    # Prefix (sorted list + bisect) and trigram index over short titles,
+    # updated incrementally. Lookups touch only the matching keys.
+    def __init__(self):
+        self._texts = {}
+        self._labels = {}
+        self._sorted = []
+        self._grams = defaultdict(set)
+
+    def __len__(self):
+        return len(self._texts)
+
+    def add(self, key, text):
+        # Keys are record ids: adding one again replaces its text.
+        self.remove(key)
+        self._labels[key] = text
+        text = text.lower()
+        self._texts[key] = text
+        insort(self._sorted, (text, key))
+        for g in trigrams(text):
+            self._grams[g].add(key)
+
+    def remove(self, key):
+        if key not in self._texts:
+            return
+        del self._labels[key]
+        text = self._texts.pop(key)
+        i = bisect_left(self._sorted, (text, key))
+        if i < len(self._sorted) and self._sorted[i] == (text, key):
+            del self._sorted[i]
+        for g in trigrams(text):
+            keys = self._grams[g]
+            keys.discard(key)
+            if not keys:
+                del self._grams[g]
+
+    def label(self, key):
+        return self._labels.get(key, "")
+
+    def clear(self):
+        self.__init__()
+
+    def search(self, query, limit=25):
+        q = query.lower().strip()
+        if not q:
+            return [key for _, key in self._sorted[:limit]]
+
+        results = []
+        i = bisect_left(self._sorted, (q,))
+        while i < len(self._sorted) and len(results) < limit and self._sorted[i][0].startswith(q):
+            results.append(self._sorted[i][1])
+            i += 1
+        grams = trigrams(q)
+        if len(results) >= limit or not grams:
+            return results
+
+        seen = set(results)
+        sets = sorted((self._grams.get(g, set()) for g in grams), key=len)
+        if sets[0]:
+            # Substring matches: every query trigram present.
+            for key in sorted(set.intersection(*sets) - seen, key=self._texts.get):
+                if q in self._texts[key]:
+                    results.append(key)
+                    seen.add(key)
+                    if len(results) >= limit:
+                        return results
+
+        # Fuzzy fallback: rank by shared trigrams (typos, word order).
+        scores = Counter()
+        for keys in sets:
+            scores.update(keys - seen)
+        need = max(1, len(grams) // 2)
+        for key, score in scores.most_common():
+            if score < need or len(results) >= limit:
+                break
+            results.append(key)
+        return results
+
+
+class GuildIndexes:
+    # One SearchIndex per guild over `field` of a schema's records, built on
+    # first use and kept in step through StoreCache.watch(schema, track).
+    # A guild's index is dropped together with its store.
+    def __init__(self, field):
+        self.field = field
+        self.guilds = {}
+        # {guild: {id: record ref}} for the autocomplete choice values.
+        self.refs = {}
+
+    def index(self, store):
+        index = self.guilds.get(store.guild_id)
+        if index is None:
+            index = self.guilds[store.guild_id] = SearchIndex()
+            refs = self.refs[store.guild_id] = {}
+            for r in store.load():
+                index.add(r["id"], r[self.field])
+                refs[r["id"]] = record_ref(r)
+        return index
+
+    def choices(self, store, query):
+        # (record ref, label) pairs matching `query`.
+        index = self.index(store)
+        refs = self.refs[store.guild_id]
+        return [(refs[key], index.label(key)) for key in index.search(query)]
+
+    def track(self, guild_id, action, r, old=None):
+        index = self.guilds.get(guild_id)
+        if index is None or action == "open":
+            return
+        if action in ("reset", "evict"):
+            del self.guilds[guild_id]
+            del self.refs[guild_id]
+            return
+        if action != "add":
+            index.remove(r["id"])
+            self.refs[guild_id].pop(r["id"], None)
+        if action != "delete":
+            index.add(r["id"], r[self.field])
+            self.refs[guild_id][r["id"]] = record_ref(r)
+
+
+def select_prompt(text, total, param):
+    # Header for a select menu; past SELECT_LIMIT options the user is
+    # pointed at the command's autocomplete parameter.
+    if total > SELECT_LIMIT:
+        return f"{text} ({SELECT_LIMIT} dari {total}, isi parameter {param} untuk mencari):"
+    return f"{text}:"
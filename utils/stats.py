@@ -0,0 +1,69 @@
+from collections import Counter
+
+
+class BotStats:
+    # Counters kept current from gateway events so /stats is O(1).
+    # `members` maps user id -> number of shared guilds; its length is the
+    # unique member count. Guilds still being chunked are "pending": their
+    # member events are ignored until the chunk lands and is counted whole.
+    def __init__(self):
+        self.guilds = set()
+        self.pending = set()
+        self.members = Counter()
+        self.member_total = 0
+        self.commands = Counter()
+
+    def add_guild(self, guild, chunking=False):
+        if guild.id in self.guilds:
+            return
+        self.guilds.add(guild.id)
+        self.member_total += guild.member_count or 0
+        if chunking:
+            self.pending.add(guild.id)
+        else:
+            self._count(guild)
+
+    def guild_chunked(self, guild):
+        if guild.id in self.pending:
+            self.pending.discard(guild.id)
+            self._count(guild)
+
+    def remove_guild(self, guild):
+        if guild.id not in self.guilds:
+            return
+        self.guilds.discard(guild.id)
+        self.member_total -= guild.member_count or 0
+        if guild.id in self.pending:
+            self.pending.discard(guild.id)
+            return
+        for m in guild.members:
+            self._drop(m.id)
+
+    def member_joined(self, guild_id, user_id):
+        if guild_id not in self.guilds:
+            return
+        self.member_total += 1
+        if guild_id not in self.pending:
+            self.members[user_id] += 1
+
+    def member_left(self, guild_id, user_id):
+        if guild_id not in self.guilds:
+            return
+        self.member_total -= 1
+        if guild_id not in self.pending:
+            self._drop(user_id)
+
+    def command_used(self, name):
+        self.commands[name] += 1
+
+    def _count(self, guild):
+        self.members.update(m.id for m in guild.members)
+
+    def _drop(self, user_id):
+        self.members[user_id] -= 1
+        if self.members[user_id] <= 0:
+            del self.members[user_id]
+
+    @property
+    def unique_members(self):
+        return len(self.members)
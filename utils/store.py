@@ -0,0 +1,643 @@
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from collections import OrderedDict
+
+from utils.guilds import LEGACY_GUILD_ID
+from utils.metrics import store_io_bytes, store_io_seconds, timed
+
+FLUSH_DELAY = 2.0
+STORE_BACKEND = os.getenv("STORE_BACKEND", "json")
+SQLITE_FILE = os.getenv("STORE_SQLITE_FILE", "bot.db")
+DATA_DIR = os.getenv("STORE_DATA_DIR", "data")
+STORE_CACHE_SIZE = int(os.getenv("STORE_CACHE_SIZE", "64"))
+
+
+# Bound parameters per statement, below SQLite's default limit of 999.
+SQL_BATCH = 500
+
+ID_FIELD = "id"
+REV_FIELD = "rev"
+REF_REGEX = re.compile(r"^(\d+)(?::(\d+))?$")
+
+
+class Schema:
+    # Describes one record collection (every record also carries an integer
+    # `id` and a `rev` counter managed by the store): the JSON file backing
+    # it, the plain fields and which columns the SQLite backend should
+    # index. Per-guild copies come from for_guild().
+    def __init__(self, name, path, fields, indexes=(), nocase=(), db_path=SQLITE_FILE,
+                 guild_id=LEGACY_GUILD_ID):
+        self.name = name
+        self.path = path
+        self.db_path = db_path
+        self.guild_id = guild_id
+        self.fields = list(fields)
+        self.indexes = list(indexes)
+        self.nocase = set(nocase)
+
+    def for_guild(self, guild_id):
+        # Every guild gets its own folder for the JSON file / SQLite db; the
+        # legacy guild keeps the top-level ones.
+        if guild_id == LEGACY_GUILD_ID:
+            return self
+        folder = os.path.join(DATA_DIR, str(guild_id))
+        return Schema(self.name, os.path.join(folder, os.path.basename(self.path)), self.fields, self.indexes,
+                      self.nocase, db_path=os.path.join(folder, os.path.basename(self.db_path)),
+                      guild_id=guild_id)
+
+    def value(self, record, column):
+        return record.get(column)
+
+    def matches(self, record, filters):
+        for col, want in filters.items():
+            have = self.value(record, col)
+            if col in self.nocase and isinstance(have, str) and isinstance(want, str):
+                have, want = have.lower(), want.lower()
+            if have != want:
+                return False
+        return True
+
+
+class BaseStore:
+    # Listeners are called as fn(action, record, old) after every write, with
+    # action in "add", "update", "delete" or "reset" (record is None). `old`
+    # is the record as it was before an update.
+    # `version` goes up on every write so readers can key caches on it.
+    version = 0
+
+    @property
+    def guild_id(self):
+        return self.schema.guild_id
+
+    @property
+    def busy(self):
+        # True while there are writes not yet on disk; busy stores are never evicted.
+        return False
+
+    def release(self):
+        pass
+
+    def reload(self):
+        # Another process changed the data behind this store.
+        self._notify("reset")
+
+    def subscribe(self, fn):
+        self.listeners.append(fn)
+
+    def unsubscribe(self, fn):
+        if fn in self.listeners:
+            self.listeners.remove(fn)
+
+    def _notify(self, action, record=None, old=None):
+        self.version += 1
+        for fn in self.listeners:
+            try:
+                fn(action, record, old)
+            except Exception as e:
+                print(f"❌ Listener {self.schema.name} error: {e}")
+
+
+class JsonStore(BaseStore):
+    # Data lives in memory; writes only mark the store dirty and a single
+    # delayed task flushes the latest snapshot to disk off the event loop.
+    def __init__(self, schema, flush_delay=FLUSH_DELAY):
+        self.schema = schema
+        self.path = schema.path
+        # Highest id ever handed out sits next to the data, so ids of
+        # deleted records are never reused (old components keep pointing
+        # at nothing instead of at a newer record).
+        self.seq_path = f"{schema.path}.seq"
+        self.flush_delay = flush_delay
+        self.listeners = []
+        self._next_id = None
+        self._data = None
+        self._dirty = False
+        self._flush_task = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def busy(self):
+        return self._dirty or self._lock.locked()
+
+    def reload(self):
+        if not self.busy:
+            self._data = None
+        self._notify("reset")
+
+    def release(self):
+        # Only called when not busy, so a pending flush has nothing to write.
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+
+    def load(self):
+        # Returns the current snapshot. Snapshots are immutable tuples of
+        # records that are never edited in place: every write builds a new
+        # tuple (copy-on-write), so readers need no lock and keep a
+        # consistent view for as long as they hold it.
+        if self._data is None:
+            self._data = self._with_ids(self._read())
+        return self._data
+
+    def save(self, data):
+        self._store(self._with_ids(data))
+        self._notify("reset")
+
+    def _with_ids(self, data):
+        # Legacy files have no ids/revs; number them once and persist.
+        ids = [r[ID_FIELD] for r in data if isinstance(r.get(ID_FIELD), int)]
+        self._next_id = max(max(ids, default=0) + 1, self._next_id or self._read_seq())
+        records, changed = [], False
+        for r in data:
+            if not isinstance(r.get(ID_FIELD), int) or REV_FIELD not in r:
+                r = {**r, REV_FIELD: r.get(REV_FIELD, 0)}
+                if not isinstance(r.get(ID_FIELD), int):
+                    r[ID_FIELD] = self._next_id
+                    self._next_id += 1
+                changed = True
+            records.append(r)
+        records = tuple(records)
+        if changed:
+            self._store(records)
+        return records
+
+    def _store(self, data):
+        self._data = data
+        self._dirty = True
+        self._schedule_flush()
+
+    def count(self):
+        return len(self.load())
+
+    def query(self, **filters):
+        return [r for r in self.load() if self.schema.matches(r, filters)]
+
+    def get(self, **filters):
+        return next((r for r in self.load() if self.schema.matches(r, filters)), None)
+
+    def add(self, record):
+        # load() first: it sets _next_id on a freshly opened store.
+        data = self.load()
+        record = {**record, ID_FIELD: self._next_id, REV_FIELD: 0}
+        self._next_id += 1
+        self._store(data + (record,))
+        self._notify("add", record)
+        return record
+
+    def add_many(self, records):
+        # One snapshot swap (and so one flush) for the whole batch.
+        data = self.load()
+        added = []
+        for r in records:
+            added.append({**r, ID_FIELD: self._next_id, REV_FIELD: 0})
+            self._next_id += 1
+        if added:
+            self._store(data + tuple(added))
+        for r in added:
+            self._notify("add", r)
+        return added
+
+    def update(self, changes, **filters):
+        # Pass rev=<seen rev> in filters for a compare-and-swap update.
+        data, changed = [], []
+        for r in self.load():
+            if self.schema.matches(r, filters):
+                new = {**r, **changes, ID_FIELD: r[ID_FIELD], REV_FIELD: r[REV_FIELD] + 1}
+                changed.append((new, r))
+                r = new
+            data.append(r)
+        if changed:
+            self._store(tuple(data))
+        for new, old in changed:
+            self._notify("update", new, old)
+        return len(changed)
+
+    def delete(self, **filters):
+        return len(self._remove(lambda r: self.schema.matches(r, filters)))
+
+    def delete_many(self, keys):
+        # keys: (id, rev) pairs; one pass over the snapshot, and a record is
+        # only removed if it still has the rev the caller saw.
+        wanted = dict(keys)
+        return len(self._remove(lambda r: wanted.get(r[ID_FIELD], -1) == r[REV_FIELD]))
+
+    def _remove(self, pred):
+        removed, kept = [], []
+        for r in self.load():
+            (removed if pred(r) else kept).append(r)
+        if removed:
+            self._store(tuple(kept))
+        for r in removed:
+            self._notify("delete", r)
+        return removed
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return []
+        with timed(store_io_seconds, self.schema.name, "load"), open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+            store_io_bytes.inc(self.schema.name, "load", amount=f.tell())
+        return data
+
+    def _read_seq(self):
+        try:
+            with open(self.seq_path, encoding="utf-8") as f:
+                return int(f.read().strip() or 1)
+        except (OSError, ValueError):
+            return 1
+
+    def _write(self, snapshot):
+        snapshot, next_id = snapshot
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        # The high-water mark goes first: ahead of the data it is harmless.
+        if next_id != self._read_seq():
+            with open(self.seq_path, "w", encoding="utf-8") as f:
+                f.write(str(next_id))
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=".json")
+        try:
+            with timed(store_io_seconds, self.schema.name, "save"), os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+                store_io_bytes.inc(self.schema.name, "save", amount=f.tell())
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _schedule_flush(self):
+        if self._flush_task and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (scripts, shutdown): write synchronously.
+            self._dirty = False
+            self._write(self._snapshot())
+            return
+        self._flush_task = loop.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self.flush_delay)
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"❌ Gagal menyimpan {self.schema.name}: {e}")
+        # Writes made while flushing (or a failed write) go out in another
+        # round; _schedule_flush() would skip them as this task still runs.
+        if self._dirty:
+            self._flush_task = asyncio.get_running_loop().create_task(self._delayed_flush())
+
+    def _snapshot(self):
+        # Snapshots are immutable, so the worker thread can serialize the
+        # current one as is.
+        return list(self._data), self._next_id
+
+    async def flush(self):
+        async with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            snapshot = self._snapshot()
+            try:
+                await asyncio.to_thread(self._write, snapshot)
+            except BaseException:
+                self._dirty = True
+                raise
+
+    async def close(self):
+        task = self._flush_task
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+
+class SqliteStore(BaseStore):
+    # Same interface as JsonStore, backed by an indexed SQLite table. Every
+    # write is a small indexed statement committed immediately (WAL mode), so
+    # there is nothing to batch.
+    def __init__(self, schema, db_path=None):
+        self.schema = schema
+        self.path = db_path or schema.db_path
+        self.table = schema.name
+        self.columns = list(schema.fields)
+        self.listeners = []
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create()
+        self._migrate()
+
+    def _create(self):
+        cols = ", ".join(
+            f"{c} TEXT COLLATE NOCASE" if c in self.schema.nocase else f"{c} TEXT"
+            for c in self.columns
+        )
+        with self.conn:
+            # Under the write lock, so two processes never add the same column.
+            self.conn.execute("BEGIN IMMEDIATE")
+            # AUTOINCREMENT: ids of deleted rows are never handed out again.
+            create = (f"CREATE TABLE IF NOT EXISTS {{}} "
+                      f"(id INTEGER PRIMARY KEY AUTOINCREMENT, rev INTEGER NOT NULL DEFAULT 0, {cols})")
+            self.conn.execute(create.format(self.table))
+            existing = {r["name"] for r in self.conn.execute(f"PRAGMA table_info({self.table})")}
+            if REV_FIELD not in existing:
+                self.conn.execute(f"ALTER TABLE {self.table} ADD COLUMN rev INTEGER NOT NULL DEFAULT 0")
+            for c in self.columns:
+                if c not in existing:
+                    self.conn.execute(f"ALTER TABLE {self.table} ADD COLUMN {c} TEXT")
+            sql = self.conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                    (self.table,)).fetchone()[0]
+            if "AUTOINCREMENT" not in sql.upper():
+                # Tables from before AUTOINCREMENT are copied over once; the
+                # sequence starts at their current max id.
+                names = ", ".join(["id", "rev"] + self.columns)
+                self.conn.execute(f"ALTER TABLE {self.table} RENAME TO {self.table}_old")
+                self.conn.execute(create.format(self.table))
+                self.conn.execute(f"INSERT INTO {self.table} ({names}) SELECT {names} FROM {self.table}_old")
+                self.conn.execute(f"DROP TABLE {self.table}_old")
+            wanted = {f"idx_{self.table}_{col}": col for col in self.schema.indexes}
+            for (name,) in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? "
+                                             "AND name LIKE 'idx_%'", (self.table,)).fetchall():
+                if name not in wanted:
+                    # Indexes a schema no longer lists only slow down writes.
+                    self.conn.execute(f"DROP INDEX {name}")
+            for name, col in wanted.items():
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {self.table}({col})")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _migrate(self):
+        # One-shot import of the legacy JSON file the first time the table is used.
+        key = f"migrated:{self.table}"
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+            return
+        rows = []
+        if os.path.exists(self.schema.path):
+            with open(self.schema.path, encoding="utf-8") as f:
+                rows = json.load(f)
+        with self.conn:
+            # Cluster processes can open a fresh db at the same time; the
+            # write lock makes the check and the import one step.
+            self.conn.execute("BEGIN IMMEDIATE")
+            if self.conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return
+            self._insert_many(rows)
+            self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, str(len(rows))))
+        if rows:
+            print(f"📦 {len(rows)} data {self.table} dimigrasi dari {self.schema.path}")
+
+    def _row(self, record):
+        return [self.schema.value(record, c) for c in self.columns]
+
+    def _insert_sql(self):
+        marks = ", ".join("?" for _ in range(len(self.columns) + 2))
+        return f"INSERT INTO {self.table} (id, rev, {', '.join(self.columns)}) VALUES ({marks})"
+
+    def _insert_many(self, records):
+        # Ids carried over from JSON are kept; None lets SQLite assign one.
+        self.conn.executemany(
+            self._insert_sql(),
+            ([r.get(ID_FIELD), r.get(REV_FIELD, 0)] + self._row(r) for r in records),
+        )
+
+    def _to_dict(self, row):
+        return {ID_FIELD: row["id"], REV_FIELD: row["rev"], **{f: row[f] for f in self.schema.fields}}
+
+    def _where(self, filters):
+        if not filters:
+            return "", []
+        for col in filters:
+            if col not in self.columns and col not in (ID_FIELD, REV_FIELD):
+                raise KeyError(col)
+        return " WHERE " + " AND ".join(f"{c} = ?" for c in filters), list(filters.values())
+
+    def load(self):
+        return self.query()
+
+    def save(self, data):
+        with timed(store_io_seconds, self.table, "save"), self.conn:
+            self.conn.execute(f"DELETE FROM {self.table}")
+            self._insert_many(data)
+        self._notify("reset")
+
+    def count(self):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def query(self, **filters):
+        where, args = self._where(filters)
+        sql = f"SELECT * FROM {self.table}{where} ORDER BY id"
+        with timed(store_io_seconds, self.table, "query"):
+            return [self._to_dict(r) for r in self.conn.execute(sql, args)]
+
+    def get(self, **filters):
+        where, args = self._where(filters)
+        with timed(store_io_seconds, self.table, "get"):
+            row = self.conn.execute(f"SELECT * FROM {self.table}{where} ORDER BY id LIMIT 1", args).fetchone()
+        return self._to_dict(row) if row else None
+
+    def add(self, record):
+        with timed(store_io_seconds, self.table, "write"), self.conn:
+            cur = self.conn.execute(self._insert_sql(), [None, 0] + self._row(record))
+        record = {**record, ID_FIELD: cur.lastrowid, REV_FIELD: 0}
+        self._notify("add", record)
+        return record
+
+    def add_many(self, records):
+        added = []
+        with timed(store_io_seconds, self.table, "write"), self.conn:
+            for r in records:
+                cur = self.conn.execute(self._insert_sql(), [None, 0] + self._row(r))
+                added.append({**r, ID_FIELD: cur.lastrowid, REV_FIELD: 0})
+        for r in added:
+            self._notify("add", r)
+        return added
+
+    def update(self, changes, **filters):
+        # Pass rev=<seen rev> in filters for a compare-and-swap update; the
+        # UPDATE re-checks rev so a concurrent writer can't be overwritten.
+        where, args = self._where(filters)
+        rows = self.conn.execute(f"SELECT * FROM {self.table}{where}", args).fetchall()
+        sets = ", ".join(f"{c} = ?" for c in self.columns)
+        changed = []
+        with timed(store_io_seconds, self.table, "write"), self.conn:
+            for row in rows:
+                old = self._to_dict(row)
+                new = {**old, **changes, ID_FIELD: old[ID_FIELD], REV_FIELD: old[REV_FIELD] + 1}
+                cur = self.conn.execute(f"UPDATE {self.table} SET rev = ?, {sets} WHERE id = ? AND rev = ?",
+                                        [new[REV_FIELD]] + self._row(new) + [old[ID_FIELD], old[REV_FIELD]])
+                if cur.rowcount:
+                    changed.append((new, old))
+        for new, old in changed:
+            self._notify("update", new, old)
+        return len(changed)
+
+    def delete(self, **filters):
+        where, args = self._where(filters)
+        return len(self._remove(where, args))
+
+    def delete_many(self, keys):
+        # keys: (id, rev) pairs, removed in one transaction; a record is only
+        # removed if it still has the rev the caller saw.
+        keys = list(keys)
+        removed = []
+        with timed(store_io_seconds, self.table, "write"), self.conn:
+            for i in range(0, len(keys), SQL_BATCH):
+                batch = dict(keys[i:i + SQL_BATCH])
+                marks = ", ".join("?" for _ in batch)
+                rows = self.conn.execute(f"SELECT * FROM {self.table} WHERE id IN ({marks})", list(batch)).fetchall()
+                rows = [r for r in rows if batch[r["id"]] == r["rev"]]
+                self.conn.executemany(f"DELETE FROM {self.table} WHERE id = ? AND rev = ?",
+                                      [(r["id"], r["rev"]) for r in rows])
+                removed += [self._to_dict(r) for r in rows]
+        for r in removed:
+            self._notify("delete", r)
+        return len(removed)
+
+    def _remove(self, where, args):
+        rows = self.conn.execute(f"SELECT * FROM {self.table}{where}", args).fetchall()
+        if rows:
+            with timed(store_io_seconds, self.table, "write"), self.conn:
+                self.conn.executemany(f"DELETE FROM {self.table} WHERE id = ?", [(r["id"],) for r in rows])
+        removed = [self._to_dict(r) for r in rows]
+        for r in removed:
+            self._notify("delete", r)
+        return removed
+
+    async def flush(self):
+        pass
+
+    def release(self):
+        self.conn.close()
+
+    async def close(self):
+        self.release()
+
+
+def record_ref(record):
+    # Value of a select option or autocomplete choice: the id plus the rev
+    # the user was shown, so a delete can compare-and-swap against it.
+    return f"{record[ID_FIELD]}:{record[REV_FIELD]}"
+
+def parse_ref(value):
+    # "id:rev" -> (id, rev); components sent before refs carried a rev
+    # give (id, None). None for any other text.
+    m = REF_REGEX.match(str(value).strip())
+    if not m:
+        return None
+    return int(m[1]), int(m[2]) if m[2] is not None else None
+
+def seen_rev(value, record):
+    # The rev the user picked, or the current one for typed text.
+    ref = parse_ref(value)
+    return ref[1] if ref and ref[1] is not None else record[REV_FIELD]
+
+def find(store, value, field):
+    # Autocomplete sends a record ref; typed text falls back to `field`.
+    ref = parse_ref(value)
+    if ref:
+        record = store.get(id=ref[0])
+        if record:
+            return record
+    return store.get(**{field: value})
+
+
+class StoreCache:
+    # Open stores keyed by (schema name, guild id), least recently used
+    # first. A guild's store is opened on first use; past `capacity` the
+    # oldest ones with nothing left to flush are released and simply
+    # reopened from disk when needed again.
+    #
+    # watch(name, fn) calls fn(guild_id, action, record, old) for writes to
+    # every store of that schema, plus "open" when one is (re)opened and
+    # "evict" when one is dropped, so per-guild caches can follow along.
+    def __init__(self, capacity=STORE_CACHE_SIZE):
+        self.capacity = capacity
+        self.stores = OrderedDict()
+        self.watchers = []
+
+    def __len__(self):
+        return len(self.stores)
+
+    def values(self):
+        return list(self.stores.values())
+
+    def peek(self, name, guild_id):
+        # The open store, if any, without opening it or touching the LRU order.
+        return self.stores.get((name, guild_id))
+
+    def get(self, schema):
+        key = (schema.name, schema.guild_id)
+        store = self.stores.get(key)
+        if store is not None:
+            self.stores.move_to_end(key)
+            return store
+        store = self.stores[key] = SqliteStore(schema) if STORE_BACKEND == "sqlite" else JsonStore(schema)
+        for name, fn in self.watchers:
+            if name == schema.name:
+                self._attach(store, fn)
+        self._evict()
+        return store
+
+    def _attach(self, store, fn):
+        def forward(action, record=None, old=None):
+            fn(store.guild_id, action, record, old)
+        forward.watcher = fn
+        store.subscribe(forward)
+        fn(store.guild_id, "open", None, None)
+
+    def _evict(self):
+        # The store just opened (last) is never a candidate.
+        idle = [k for k, s in list(self.stores.items())[:-1] if not s.busy]
+        for key in idle[:max(len(self.stores) - self.capacity, 0)]:
+            store = self.stores.pop(key)
+            store.release()
+            for name, fn in self.watchers:
+                if name == store.schema.name:
+                    fn(store.guild_id, "evict", None, None)
+
+    def watch(self, name, fn):
+        self.watchers.append((name, fn))
+        for store in self.values():
+            if store.schema.name == name:
+                self._attach(store, fn)
+
+    def unwatch(self, fn):
+        self.watchers = [(n, f) for n, f in self.watchers if f != fn]
+        for store in self.values():
+            for listener in [l for l in store.listeners if getattr(l, "watcher", None) == fn]:
+                store.unsubscribe(listener)
+
+
+def stores(bot):
+    if not hasattr(bot, "stores"):
+        bot.stores = StoreCache()
+    return bot.stores
+
+def get_store(bot, schema, guild_id=LEGACY_GUILD_ID):
+    return stores(bot).get(schema.for_guild(guild_id))
+
+def stored_guilds():
+    # Guilds that have data on disk, without opening their stores.
+    guilds = [LEGACY_GUILD_ID]
+    if os.path.isdir(DATA_DIR):
+        guilds += [int(d) for d in sorted(os.listdir(DATA_DIR)) if d.isdigit() and int(d) != LEGACY_GUILD_ID]
+    return guilds
+
+
+async def close_stores(bot):
+    for store in stores(bot).values():
+        try:
+            await store.close()
+        except Exception as e:
+            print(f"❌ Gagal menyimpan {store.path}: {e}")
@@ -0,0 +1,40 @@
+import hashlib
+import json
+import os
+
+import discord
+
+HASH_FILE = ".command_hash"
+
+
+def command_payload(tree):
+    payload = []
+    for kind in (discord.AppCommandType.chat_input, discord.AppCommandType.user, discord.AppCommandType.message):
+        for cmd in tree.get_commands(type=kind):
+            try:
+                payload.append(cmd.to_dict(tree))
+            except TypeError:
+                payload.append(cmd.to_dict())
+    return sorted(payload, key=lambda c: (c.get("type", 1), c["name"]))
+
+
+def tree_hash(tree):
+    data = json.dumps(command_payload(tree), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+async def sync_if_changed(bot, path=HASH_FILE):
+    # Global syncs are slow and rate limited; only sync when the serialized
+    # command tree differs from the last one we pushed.
+    digest = tree_hash(bot.tree)
+    key = f"{bot.application_id}:{digest}"
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            if f.read().strip() == key:
+                print("✅ Command tree tidak berubah, sync dilewati.")
+                return False
+    synced = await bot.tree.sync()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(key)
+    print(f"✅ {len(synced)} command disinkronkan.")
+    return True
@@ -0,0 +1,80 @@
+import datetime
+from bisect import bisect_right
+
+import pytz
+
+TIME_ZONES = {
+    "WIB": "Asia/Jakarta", "WITA": "Asia/Makassar", "WIT": "Asia/Jayapura",
+    "EST": "America/New_York", "PST": "America/Los_Angeles", "CET": "Europe/Berlin",
+    "GMT": "GMT", "UTC": "UTC", "AEST": "Australia/Sydney"
+}
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+class Zone:
+    # A TIME_ZONES entry compiled once: the pytz object plus its UTC offset
+    # transition table, so conversions are a bisect instead of a tz lookup.
+    def __init__(self, abbr, name):
+        self.abbr = abbr
+        self.name = name
+        self.tz = pytz.timezone(name)
+        times = getattr(self.tz, "_utc_transition_times", None)
+        if times:
+            self.starts = [(t - EPOCH).total_seconds() for t in times]
+            self.offsets = [info[0].total_seconds() for info in self.tz._transition_info]
+            self.dst = [bool(info[1]) for info in self.tz._transition_info]
+        else:
+            self.starts = [float("-inf")]
+            self.offsets = [self.tz.utcoffset(datetime.datetime(2000, 1, 1)).total_seconds()]
+            self.dst = [False]
+
+    def offset_at(self, ts):
+        return self.offsets[max(bisect_right(self.starts, ts) - 1, 0)]
+
+    def to_utc(self, local):
+        # Naive local datetime -> UTC epoch seconds. Times in a DST gap move
+        # forward, ambiguous times resolve to the earlier offset.
+        t = (local - EPOCH).total_seconds()
+        # The offsets a day either side cover any transition next to t.
+        before, after = self.offset_at(t - 86400), self.offset_at(t + 86400)
+        valid = [off for off in (before, after) if self.offset_at(t - off) == off]
+        if not valid:
+            # In the gap: read with the old offset, which lands past it.
+            return t - before
+        return t - max(valid)
+
+    def from_utc(self, ts):
+        return EPOCH + datetime.timedelta(seconds=ts + self.offset_at(ts))
+
+    def transitions(self, since):
+        # (epoch, offset before, offset after, is DST) for the offset in
+        # effect at `since` and every change after it in the tz table.
+        i = max(bisect_right(self.starts, since) - 1, 0)
+        yield since, self.offsets[i], self.offsets[i], self.dst[i]
+        for j in range(i + 1, len(self.starts)):
+            yield self.starts[j], self.offsets[j - 1], self.offsets[j], self.dst[j]
+
+
+ZONES = {abbr: Zone(abbr, name) for abbr, name in TIME_ZONES.items()}
+
+
+def _choice_table():
+    # Every substring of every abbreviation -> matching zones, built once.
+    table = {}
+    for abbr in TIME_ZONES:
+        low = abbr.lower()
+        subs = {low[i:j] for i in range(len(low)) for j in range(i, len(low) + 1)}
+        for sub in subs:
+            table.setdefault(sub, []).append(abbr)
+    return table
+
+
+ZONE_CHOICES = _choice_table()
+
+
+def zone_matches(current):
+    return ZONE_CHOICES.get(current.lower().strip(), [])
+
+
+def convert(local, dari, ke):
+    return ZONES[ke].from_utc(ZONES[dari].to_utc(local))